@@ -5,109 +5,173 @@ AB: τ = [1/3, 1/3] - Standard B-site over A-site
 BA: τ = [2/3, 2/3] - Standard A-site over B-site (opposite polarity)
 """
 
+import functools
+import io
+import mmap
+import os
+import re
 import numpy as np
+from pathlib import Path
+
+CELL_RE = re.compile(rb"^\s*_cell_(?:length|angle)_(\w+)\s+(\S+)", re.M)
+ATOM_SITE_FIELDS = ('type_symbol', 'label', 'fract_x', 'fract_y', 'fract_z')
+ATOM_ROW_FMT = "  %s   %s        1.0  %.12f  %.12f  %.12f  1.0000"
 
 def read_monolayer_cif(filename):
-    """Read monolayer CIF and extract structure parameters"""
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-    
-    a = b = c = None
-    alpha = beta = gamma = None
-    atoms = []
-    
-    for line in lines:
-        if '_cell_length_a' in line:
-            a = float(line.split()[1])
-        elif '_cell_length_b' in line:
-            b = float(line.split()[1])
-        elif '_cell_length_c' in line:
-            c = float(line.split()[1])
-        elif '_cell_angle_alpha' in line:
-            alpha = float(line.split()[1])
-        elif '_cell_angle_beta' in line:
-            beta = float(line.split()[1])
-        elif '_cell_angle_gamma' in line:
-            gamma = float(line.split()[1])
-        elif len(line.strip()) > 0 and not line.startswith('_') and not line.startswith('loop_') and not line.startswith('data_') and not line.startswith("'"):
-            parts = line.strip().split()
-            if len(parts) >= 6:
-                element = parts[0]
-                label = parts[1]
-                x = float(parts[3])
-                y = float(parts[4])
-                z = float(parts[5])
-                atoms.append((element, label, x, y, z))
-    
-    return {
-        'a': a, 'b': b, 'c': c,
-        'alpha': alpha, 'beta': beta, 'gamma': gamma,
-        'atoms': atoms
-    }
+    """
+    Read monolayer CIF and extract structure parameters (cached per file mtime).
+    
+    Atoms are returned struct-of-arrays: 'elements' and 'labels' are (N,)
+    object arrays and 'frac' is a contiguous (N,3) float64 array. The arrays
+    are shared between cached calls and are therefore read-only.
+    """
+    return _read_monolayer_cif(filename, os.path.getmtime(filename))
+
+@functools.lru_cache(maxsize=None)
+def _read_monolayer_cif(filename, mtime):
+    """Parse the CIF and precompute the layer geometry shared by every stacking"""
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Cell parameters: _cell_length_{a,b,c} and _cell_angle_{alpha,beta,gamma}
+        data = {key.decode(): float(value) for key, value in CELL_RE.findall(mm)}
+        # Only the atom-site loop onwards is decoded into Python strings
+        text = mm[mm.find(b'_atom_site_'):].decode()
+    
+    # Atom-site loop: header tags followed by one row per atom
+    lines = [line.strip() for line in text.splitlines()]
+    i = 0
+    header = []
+    while lines[i].startswith('_'):
+        header.append(lines[i])
+        i += 1
+    atom_lines = []
+    for line in lines[i:]:
+        if line.startswith(('_', 'loop_', 'data_')):
+            break
+        if line and not line.startswith('#'):
+            atom_lines.append(line)
+    
+    cols = [header.index(f'_atom_site_{field}') for field in ATOM_SITE_FIELDS]
+    table = np.loadtxt(io.StringIO("\n".join(atom_lines)), dtype=str, usecols=cols, ndmin=2)
+    
+    data.update({
+        'elements': table[:, 0].astype(object),
+        'labels': table[:, 1].astype(object),
+        'frac': np.ascontiguousarray(table[:, 2:], dtype=np.float64)
+    })
+    
+    # Invariant layer geometry, reused for every stacking
+    z = data['frac'][:, 2]
+    data['z_min'] = z.min()
+    data['layer_thickness_frac'] = z.max() - data['z_min']
+    data['layer_thickness_ang'] = data['layer_thickness_frac'] * data['c']
+    data['z_norm'] = (z - data['z_min']) / data['layer_thickness_frac']
+    for key in ('elements', 'labels', 'frac', 'z_norm'):
+        data[key].flags.writeable = False
+    return data
+
+def _place_layers_numpy(frac, z_norm, tau, thickness_ang, center1_ang, center2_ang, new_c, out):
+    """Fill out[:N] with the bottom layer and out[N:] with the tau-shifted top layer"""
+    n = frac.shape[0]
+    z_layer = (z_norm - 0.5) * thickness_ang
+    out[:n, :2] = frac[:, :2]
+    out[:n, 2] = (center1_ang + z_layer) / new_c
+    out[n:, :2] = np.mod(frac[:, :2] + tau[:2], 1.0)
+    out[n:, 2] = (center2_ang + z_layer) / new_c
+
+# Atoms per layer from which the numba kernel is used: below it, importing
+# numba, loading the compiled kernel and starting its threads (~0.5 s) cost
+# more than the NumPy version saves (~70 ns per atom)
+NUMBA_MIN_ATOMS = 5_000_000
+
+@functools.lru_cache(maxsize=None)
+def _place_layers_numba():
+    """Compiled per-atom version of _place_layers_numpy, or None without numba"""
+    try:
+        import numba
+    except ImportError:  # optional: NumPy version only
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def kernel(frac, z_norm, tau, thickness_ang, center1_ang, center2_ang, new_c, out):
+        n = frac.shape[0]
+        for i in numba.prange(n):
+            z_layer = (z_norm[i] - 0.5) * thickness_ang
+            out[i, 0] = frac[i, 0]
+            out[i, 1] = frac[i, 1]
+            out[i, 2] = (center1_ang + z_layer) / new_c
+            out[n + i, 0] = (frac[i, 0] + tau[0]) % 1.0
+            out[n + i, 1] = (frac[i, 1] + tau[1]) % 1.0
+            out[n + i, 2] = (center2_ang + z_layer) / new_c
+
+    return kernel
+
+def place_layers(frac, z_norm, tau, thickness_ang, center1_ang, center2_ang, new_c, out):
+    """_place_layers_numpy, or its numba kernel for layers of NUMBA_MIN_ATOMS atoms or more"""
+    kernel = _place_layers_numba() if len(frac) >= NUMBA_MIN_ATOMS else None
+    (kernel or _place_layers_numpy)(frac, z_norm, tau, thickness_ang,
+                                    center1_ang, center2_ang, new_c, out)
 
 def create_bilayer_cif(monolayer_data, tau, interlayer_distance_angstrom, output_file, stacking_type, description):
     """Create bilayer CIF with exact interlayer distance"""
     
-    # Extract actual layer thickness from atom positions
-    z_coords = [atom[4] for atom in monolayer_data['atoms']]
-    z_min, z_max = min(z_coords), max(z_coords)
-    layer_thickness_frac = z_max - z_min
-    layer_thickness_ang = layer_thickness_frac * monolayer_data['c']
+    frac = monolayer_data['frac']
+    layer_thickness_ang = monolayer_data['layer_thickness_ang']
     
     # Design bilayer structure
     vacuum = 15.0  # Vacuum on top and bottom
     new_c_angstrom = vacuum + layer_thickness_ang + interlayer_distance_angstrom + layer_thickness_ang + vacuum
     
-    with open(output_file, 'w') as f:
-        f.write(f"data_WS2_bilayer_{stacking_type}\n")
-        f.write("_chemical_formula_structural       W2S4\n")
-        f.write('_chemical_formula_sum              "W2 S4"\n')
-        f.write(f"_cell_length_a       {monolayer_data['a']:.12f}\n")
-        f.write(f"_cell_length_b       {monolayer_data['b']:.12f}\n")
-        f.write(f"_cell_length_c       {new_c_angstrom:.12f}\n")
-        f.write(f"_cell_angle_alpha    {monolayer_data['alpha']}\n")
-        f.write(f"_cell_angle_beta     {monolayer_data['beta']}\n")
-        f.write(f"_cell_angle_gamma    {monolayer_data['gamma']}\n")
-        f.write("\n")
-        f.write('_space_group_name_H-M_alt    "P 1"\n')
-        f.write("_space_group_IT_number       1\n")
-        f.write("\n")
-        f.write("loop_\n")
-        f.write("  _space_group_symop_operation_xyz\n")
-        f.write("  'x, y, z'\n")
-        f.write("\n")
-        f.write("loop_\n")
-        f.write("  _atom_site_type_symbol\n")
-        f.write("  _atom_site_label\n")
-        f.write("  _atom_site_symmetry_multiplicity\n")
-        f.write("  _atom_site_fract_x\n")
-        f.write("  _atom_site_fract_y\n")
-        f.write("  _atom_site_fract_z\n")
-        f.write("  _atom_site_occupancy\n")
-        
-        # Layer 1 (bottom) - normalize and center
-        layer1_center_ang = vacuum + layer_thickness_ang/2
-        for i, (element, label, x, y, z) in enumerate(monolayer_data['atoms']):
-            z_normalized = (z - z_min) / layer_thickness_frac
-            z_layer = (z_normalized - 0.5) * layer_thickness_ang
-            new_z = (layer1_center_ang + z_layer) / new_c_angstrom
-            f.write(f"  {element}   {label}_L1        1.0  {x:.12f}  {y:.12f}  {new_z:.12f}  1.0000\n")
-        
-        # Layer 2 (top) - apply tau shift and place above gap
-        layer2_center_ang = vacuum + layer_thickness_ang + interlayer_distance_angstrom + layer_thickness_ang/2
-        for i, (element, label, x, y, z) in enumerate(monolayer_data['atoms']):
-            # Apply tau shift
-            new_x = (x + tau[0]) % 1.0
-            new_y = (y + tau[1]) % 1.0
-            z_normalized = (z - z_min) / layer_thickness_frac
-            z_layer = (z_normalized - 0.5) * layer_thickness_ang
-            new_z = (layer2_center_ang + z_layer) / new_c_angstrom
-            f.write(f"  {element}   {label}_L2        1.0  {new_x:.12f}  {new_y:.12f}  {new_z:.12f}  1.0000\n")
-        
-        f.write(f"\n# {description}\n")
-        f.write(f"# tau = [{tau[0]:.6f}, {tau[1]:.6f}] (high-symmetry stacking)\n")
-        f.write(f"# Interlayer distance = {interlayer_distance_angstrom:.1f} Å\n")
-        f.write(f"# Layer thickness = {layer_thickness_ang:.2f} Å each\n")
+    # Layer 1 (bottom) - normalize and center
+    layer1_center_ang = vacuum + layer_thickness_ang/2
+    
+    # Layer 2 (top) - apply tau shift and place above gap
+    layer2_center_ang = vacuum + layer_thickness_ang + interlayer_distance_angstrom + layer_thickness_ang/2
+    
+    # Both layers stacked bottom-then-top, one row per atom
+    xyz = np.empty((2 * len(frac), 3))
+    place_layers(frac, monolayer_data['z_norm'], np.asarray(tau, dtype=np.float64),
+                 layer_thickness_ang, layer1_center_ang, layer2_center_ang, new_c_angstrom, xyz)
+    elements = np.concatenate([monolayer_data['elements'], monolayer_data['elements']])
+    labels = np.concatenate([monolayer_data['labels'] + '_L1', monolayer_data['labels'] + '_L2'])
+    
+    lines = [
+        f"data_WS2_bilayer_{stacking_type}",
+        "_chemical_formula_structural       W2S4",
+        '_chemical_formula_sum              "W2 S4"',
+        f"_cell_length_a       {monolayer_data['a']:.12f}",
+        f"_cell_length_b       {monolayer_data['b']:.12f}",
+        f"_cell_length_c       {new_c_angstrom:.12f}",
+        f"_cell_angle_alpha    {monolayer_data['alpha']}",
+        f"_cell_angle_beta     {monolayer_data['beta']}",
+        f"_cell_angle_gamma    {monolayer_data['gamma']}",
+        "",
+        '_space_group_name_H-M_alt    "P 1"',
+        "_space_group_IT_number       1",
+        "",
+        "loop_",
+        "  _space_group_symop_operation_xyz",
+        "  'x, y, z'",
+        "",
+        "loop_",
+        "  _atom_site_type_symbol",
+        "  _atom_site_label",
+        "  _atom_site_symmetry_multiplicity",
+        "  _atom_site_fract_x",
+        "  _atom_site_fract_y",
+        "  _atom_site_fract_z",
+        "  _atom_site_occupancy",
+    ]
+    lines += [ATOM_ROW_FMT % (element, label, x, y, z)
+              for element, label, (x, y, z) in zip(elements, labels, xyz.tolist())]
+    lines += [
+        "",
+        f"# {description}",
+        f"# tau = [{tau[0]:.6f}, {tau[1]:.6f}] (high-symmetry stacking)",
+        f"# Interlayer distance = {interlayer_distance_angstrom:.1f} Å",
+        f"# Layer thickness = {layer_thickness_ang:.2f} Å each",
+    ]
+    
+    Path(output_file).write_text("\n".join(lines) + "\n")
 
 def analyze_stacking_geometry(tau_AB, tau_BA):
     """Analyze the geometric relationship between AB and BA stackings"""
@@ -121,15 +185,12 @@ def analyze_stacking_geometry(tau_AB, tau_BA):
     diff = tau_BA - tau_AB
     print(f"BA - AB = [{diff[0]:.6f}, {diff[1]:.6f}]")
     
-    # Check if BA = -AB (mod 1)
-    neg_AB = (-tau_AB) % 1.0
-    is_inversion = np.allclose(tau_BA, neg_AB, atol=1e-6)
+    # Candidate partners of AB: -AB (mod 1) and 1 - AB, compared against BA in one pass
+    neg_AB, one_minus_AB = candidates = np.stack([(-tau_AB) % 1.0, 1.0 - tau_AB])
+    is_inversion, is_complement = np.all(np.isclose(candidates, tau_BA, atol=1e-6), axis=1)
+    
     print(f"-AB (mod 1) = [{neg_AB[0]:.6f}, {neg_AB[1]:.6f}]")
     print(f"Is BA = -AB? {is_inversion}")
-    
-    # Check if BA = 1 - AB
-    one_minus_AB = 1.0 - tau_AB
-    is_complement = np.allclose(tau_BA, one_minus_AB, atol=1e-6)
     print(f"1 - AB = [{one_minus_AB[0]:.6f}, {one_minus_AB[1]:.6f}]")
     print(f"Is BA = 1 - AB? {is_complement}")
     
@@ -147,7 +208,7 @@ def main():
     monolayer_data = read_monolayer_cif('1WS2-1.cif')
     print(f"WS2 monolayer structure:")
     print(f"  a = {monolayer_data['a']:.3f} Å")
-    print(f"  atoms: {len(monolayer_data['atoms'])}")
+    print(f"  atoms: {len(monolayer_data['frac'])}")
     
     interlayer_distance = 3.1
     
@@ -5,11 +5,23 @@ Analyze black phosphorene (4P-1) for out-of-plane polarization
 
 import sys
 import os
+import re
 sys.path.insert(0, os.path.abspath('../..'))
 
 import numpy as np
 from sympol2d.c2db_interface import C2DBInterface
 
+# Layer-group symbol (e.g. 'pmna', 'p-6m2'): an optional lattice letter, then
+# the symmetry elements. Each lookahead captures its element class if it occurs
+# anywhere in the symbol, whatever the lattice letter: rotation 2/3/4/6,
+# mirror m, glide a/g/n, inversion '-' or 'i' (same classes as the original
+# substring checks). Always matches; absent elements capture None.
+LG_RE = re.compile(r'''^(?P<lattice>[pcf])?
+                       (?=(?P<rot>.*?[2346])?)
+                       (?=(?P<mirror>.*?m)?)
+                       (?=(?P<glide>.*?[agn])?)
+                       (?=(?P<inv>.*?[-i])?)''', re.I | re.X)
+
 # Connect to database
 db = C2DBInterface('../../raw/c2db.db')
 
@@ -30,9 +42,7 @@ print(f'Layer group: {material.layer_group}')
 print(f'Number of atoms: {material.natoms}')
 
 print(f'\nLattice parameters:')
-a = np.linalg.norm(material.lattice[0])
-b = np.linalg.norm(material.lattice[1])
-c = np.linalg.norm(material.lattice[2])
+a, b, c = np.linalg.norm(material.lattice, axis=1)
 print(f'  a = {a:.4f} Å')
 print(f'  b = {b:.4f} Å')
 print(f'  c = {c:.4f} Å')
@@ -43,15 +53,14 @@ for i, vec in enumerate(material.lattice):
 
 print(f'\nAtomic positions (Cartesian coordinates):')
 symbols = material.get_chemical_symbols()
-for i, (sym, pos) in enumerate(zip(symbols, material.positions)):
-    print(f'  {i+1}. {sym}: ({pos[0]:.4f}, {pos[1]:.4f}, {pos[2]:.4f})')
+print('\n'.join(f'  {i}. {sym}: ({x:.4f}, {y:.4f}, {z:.4f})'
+                for i, (sym, (x, y, z)) in enumerate(zip(symbols, material.positions.tolist()), 1)))
 
 # Get fractional coordinates
-inv_lattice = np.linalg.inv(material.lattice)
-frac_positions = material.positions @ inv_lattice.T
+frac_positions = material.positions @ material.inv_lattice.T
 print(f'\nAtomic positions (Fractional coordinates):')
-for i, (sym, pos) in enumerate(zip(symbols, frac_positions)):
-    print(f'  {i+1}. {sym}: ({pos[0]:.6f}, {pos[1]:.6f}, {pos[2]:.6f})')
+print('\n'.join(f'  {i}. {sym}: ({x:.6f}, {y:.6f}, {z:.6f})'
+                for i, (sym, (x, y, z)) in enumerate(zip(symbols, frac_positions.tolist()), 1)))
 
 # Check z-coordinates to understand the layer structure
 z_coords = material.positions[:, 2]
@@ -68,14 +77,15 @@ print(f'\nLayer group: {material.layer_group}')
 
 # Based on layer group, determine symmetry properties
 # Black phosphorene typically has pmna (or p21/c in 2D projection)
-if 'p' in material.layer_group.lower():
+lg_match = LG_RE.match(material.layer_group)
+if (lg_match['lattice'] or '').lower() == 'p':
     print("Point group type: Primitive")
 
 # Check for specific symmetry elements in the layer group notation
-has_mirror = 'm' in material.layer_group.lower()
-has_glide = 'g' in material.layer_group.lower() or 'n' in material.layer_group.lower() or 'a' in material.layer_group.lower()
-has_rotation = '2' in material.layer_group or '3' in material.layer_group or '4' in material.layer_group or '6' in material.layer_group
-has_inversion = '-' in material.layer_group or 'i' in material.layer_group.lower()
+has_mirror = bool(lg_match['mirror'])
+has_glide = bool(lg_match['glide'])
+has_rotation = bool(lg_match['rot'])
+has_inversion = bool(lg_match['inv'])
 
 print(f'\nSymmetry elements detected from layer group {material.layer_group}:')
 if has_rotation:
@@ -101,10 +111,7 @@ if z_range > 0.1:  # If z-variation > 0.1 Å, it's puckered
 
     # Group atoms by z-coordinate to identify sublayers
     z_tol = 0.1
-    z_groups = []
-    for z in unique_z:
-        mask = np.abs(z_coords - z) < z_tol
-        z_groups.append(np.sum(mask))
+    z_groups = np.count_nonzero(np.abs(z_coords[None, :] - unique_z[:, None]) < z_tol, axis=1)
 
     print(f'  Atoms distributed in {len(unique_z)} sublayers:')
     for i, (z, count) in enumerate(zip(unique_z, z_groups)):
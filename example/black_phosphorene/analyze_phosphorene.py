@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.abspath('../..'))
 
 import numpy as np
 from sympol2d.c2db_interface import C2DBInterface
-from sympol2d.symmetry import LayerGroupSymmetry
+from sympol2d.symmetry import get_symmetry
 from sympol2d.scanner import StackingScanner
 from sympol2d.cif_writer import write_bilayer_cif
 from sympol2d.utils import estimate_interlayer_distance
@@ -33,9 +33,7 @@ print(f'Layer group: {material.layer_group}')
 print(f'Number of atoms: {material.natoms}')
 
 print(f'\nLattice parameters:')
-a = np.linalg.norm(material.lattice[0])
-b = np.linalg.norm(material.lattice[1])
-c = np.linalg.norm(material.lattice[2])
+a, b, c = np.linalg.norm(material.lattice, axis=1)
 print(f'  a = {a:.4f} Å')
 print(f'  b = {b:.4f} Å')
 print(f'  c = {c:.4f} Å')
@@ -46,15 +44,14 @@ for i, vec in enumerate(material.lattice):
 
 print(f'\nAtomic positions (Cartesian coordinates):')
 symbols = material.get_chemical_symbols()
-for i, (sym, pos) in enumerate(zip(symbols, material.positions)):
-    print(f'  {i+1}. {sym}: ({pos[0]:.4f}, {pos[1]:.4f}, {pos[2]:.4f})')
+print('\n'.join(f'  {i}. {sym}: ({x:.4f}, {y:.4f}, {z:.4f})'
+                for i, (sym, (x, y, z)) in enumerate(zip(symbols, material.positions.tolist()), 1)))
 
 # Get fractional coordinates
-inv_lattice = np.linalg.inv(material.lattice)
-frac_positions = material.positions @ inv_lattice.T
+frac_positions = material.positions @ material.inv_lattice.T
 print(f'\nAtomic positions (Fractional coordinates):')
-for i, (sym, pos) in enumerate(zip(symbols, frac_positions)):
-    print(f'  {i+1}. {sym}: ({pos[0]:.6f}, {pos[1]:.6f}, {pos[2]:.6f})')
+print('\n'.join(f'  {i}. {sym}: ({x:.6f}, {y:.6f}, {z:.6f})'
+                for i, (sym, (x, y, z)) in enumerate(zip(symbols, frac_positions.tolist()), 1)))
 
 # Check z-coordinates to understand the layer structure
 z_coords = material.positions[:, 2]
@@ -67,7 +64,7 @@ print(f'\n{"="*70}')
 print('SYMMETRY ANALYSIS')
 print('='*70)
 
-lg = LayerGroupSymmetry(material.layer_group)
+lg = get_symmetry(material.layer_group)
 print(f'\nLayer group: {material.layer_group}')
 print(f'Symmetry operations present:')
 for op in lg.operations:
@@ -89,7 +86,7 @@ print('BILAYER STACKING ANALYSIS FOR OUT-OF-PLANE POLARIZATION')
 print('='*70)
 
 # Estimate interlayer distance
-d_estimate = estimate_interlayer_distance(material.formula)
+d_estimate = estimate_interlayer_distance(material.numbers)
 print(f'\nEstimated interlayer distance: {d_estimate:.2f} Å')
 
 # Create scanner
@@ -116,15 +113,22 @@ if polar_stackings:
     print('='*70)
 
     print(f'\nTop polar stackings by polarization magnitude:')
-    # Sort by polarization magnitude
-    polar_stackings.sort(key=lambda x: np.linalg.norm(x.polarization) if x.polarization is not None else 0, reverse=True)
-
-    for i, stacking in enumerate(polar_stackings[:5], 1):
+    # Sort by polarization magnitude (all norms in one call); vectors are
+    # zero-padded to 3 components, a missing polarization counts as 0
+    pols = np.zeros((len(polar_stackings), 3))
+    for row, r in zip(pols, polar_stackings):
+        if r.polarization is not None:
+            row[:len(r.polarization)] = r.polarization
+    pol_mags = np.linalg.norm(pols, axis=1)
+    order = np.argsort(-pol_mags, kind='stable')
+    polar_stackings = [polar_stackings[j] for j in order]
+    pol_mags = pol_mags[order]
+
+    for i, (stacking, pol_mag) in enumerate(zip(polar_stackings[:5], pol_mags), 1):
         shift = stacking.shift
         pol = stacking.polarization
         if pol is not None:
             pol_z = pol[2] if len(pol) > 2 else 0
-            pol_mag = np.linalg.norm(pol)
             print(f'\n  {i}. Shift: ({shift[0]:.3f}, {shift[1]:.3f})')
             print(f'     Fractional shift: ({shift[0]/a:.3f}, {shift[1]/b:.3f})')
             print(f'     Polarization: [{pol[0]:.4f}, {pol[1]:.4f}, {pol[2]:.4f}] e·Å')
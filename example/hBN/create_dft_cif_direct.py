@@ -3,32 +3,32 @@
 Create DFT-ready h-BN bilayer CIF files directly
 """
 
+import math
 import numpy as np
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from pathlib import Path
 
-def write_cif_file(filename, stacking_type, tau, description):
-    """
-    Write a DFT-ready CIF file for h-BN bilayer.
-    """
+# Invariants shared by every file written in one run
+SQRT3 = math.sqrt(3.0)
+GEN_TIME = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    # h-BN parameters
-    a = 2.504  # lattice parameter in Angstroms
-    c = 25.0   # c-axis with ~20 Å vacuum
-    interlayer = 3.33  # interlayer distance in Angstroms
+HBN_A = 2.504  # h-BN lattice parameter in Angstroms
 
-    # Calculate z positions for centering the bilayer in the cell
-    z_center = 0.5
-    z_offset = interlayer / (2 * c)
-    z1 = z_center - z_offset  # First layer
-    z2 = z_center + z_offset  # Second layer
+# Monolayer in-plane fractional sites: B, N
+HBN_BASE_FRAC = np.array([[0.0, 0.0],
+                          [0.333333, 0.666667]])
 
-    cif_content = f"""# DFT-ready h-BN bilayer structure
+HBN_C = 25.0           # c-axis with ~20 Å vacuum
+HBN_INTERLAYER = 3.33  # interlayer distance in Angstroms
+
+TEMPLATE_CIF = """# DFT-ready h-BN bilayer structure
 # Generated for DFT calculations with proper vacuum spacing
-# Stacking: {stacking_type} - tau = [{tau[0]:.4f}, {tau[1]:.4f}]
+# Stacking: {stacking_type} - tau = [{tau0:.4f}, {tau1:.4f}]
 # Interlayer distance: {interlayer:.3f} Angstroms
 # Vacuum spacing: ~20 Angstroms
 # Description: {description}
-# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+# Date: {date}
 
 data_{stacking_type}_hBN_DFT
 
@@ -53,75 +53,25 @@ _atom_site_fract_z
 _atom_site_occupancy
 B1   B    0.000000   0.000000   {z1:.6f}   1.0
 N1   N    0.333333   0.666667   {z1:.6f}   1.0
-B2   B    {tau[0]:.6f}   {tau[1]:.6f}   {z2:.6f}   1.0
-N2   N    {(0.333333 + tau[0]) % 1:.6f}   {(0.666667 + tau[1]) % 1:.6f}   {z2:.6f}   1.0
+B2   B    {tau0:.6f}   {tau1:.6f}   {z2:.6f}   1.0
+N2   N    {n2x:.6f}   {n2y:.6f}   {z2:.6f}   1.0
 """
 
-    with open(filename, 'w') as f:
-        f.write(cif_content)
-
-    return a, c, interlayer
-
-
-def create_vasp_poscar(filename, stacking_type, tau, description):
-    """
-    Create VASP POSCAR file for h-BN bilayer.
-    """
-
-    # h-BN parameters
-    a = 2.504
-    c = 25.0
-    interlayer = 3.33
-
-    # Calculate z positions
-    z_center = 0.5
-    z_offset = interlayer / (2 * c)
-    z1 = z_center - z_offset
-    z2 = z_center + z_offset
-
-    poscar_content = f"""h-BN {stacking_type} bilayer - {description}
+TEMPLATE_POSCAR = """h-BN {stacking_type} bilayer - {description}
 1.0
-    {a:.6f}    0.000000    0.000000
-   {-a/2:.6f}   {a*np.sqrt(3)/2:.6f}    0.000000
+    {a1x:.6f}    0.000000    0.000000
+   {a2x:.6f}   {a2y:.6f}    0.000000
     0.000000    0.000000   {c:.6f}
 B    N
 2    2
 Direct
     0.000000    0.000000   {z1:.6f}
-    {tau[0]:.6f}    {tau[1]:.6f}   {z2:.6f}
+    {tau0:.6f}    {tau1:.6f}   {z2:.6f}
     0.333333    0.666667   {z1:.6f}
-    {(0.333333 + tau[0]) % 1:.6f}    {(0.666667 + tau[1]) % 1:.6f}   {z2:.6f}
+    {n2x:.6f}    {n2y:.6f}   {z2:.6f}
 """
 
-    with open(filename, 'w') as f:
-        f.write(poscar_content)
-
-
-def create_quantum_espresso_input(filename, stacking_type, tau, description):
-    """
-    Create Quantum ESPRESSO input file template.
-    """
-
-    a = 2.504
-    c = 25.0
-    interlayer = 3.33
-
-    # Calculate z positions
-    z_center = 0.5
-    z_offset = interlayer / (2 * c)
-    z1 = z_center - z_offset
-    z2 = z_center + z_offset
-
-    # Convert to Cartesian coordinates for QE
-    positions = [
-        (0.0, 0.0, z1 * c),
-        (0.0, a/np.sqrt(3), z1 * c),
-        (tau[0] * a - tau[1] * a/2, tau[1] * a * np.sqrt(3)/2, z2 * c),
-        ((0.333333 + tau[0]) * a - (0.666667 + tau[1]) * a/2,
-         (0.666667 + tau[1]) * a * np.sqrt(3)/2, z2 * c)
-    ]
-
-    qe_content = f"""&CONTROL
+TEMPLATE_QE = """&CONTROL
     calculation = 'scf'
     prefix = 'hBN_{stacking_type}'
     pseudo_dir = './pseudo/'
@@ -149,22 +99,110 @@ ATOMIC_SPECIES
     N  14.01  N.pbe-n-kjpaw_psl.1.0.0.UPF
 
 CELL_PARAMETERS (angstrom)
-    {a:.6f}    0.000000    0.000000
-   {-a/2:.6f}   {a*np.sqrt(3)/2:.6f}    0.000000
+    {a1x:.6f}    0.000000    0.000000
+   {a2x:.6f}   {a2y:.6f}    0.000000
     0.000000    0.000000   {c:.6f}
 
 ATOMIC_POSITIONS (crystal)
     B    0.000000    0.000000   {z1:.6f}
     N    0.333333    0.666667   {z1:.6f}
-    B    {tau[0]:.6f}    {tau[1]:.6f}   {z2:.6f}
-    N    {(0.333333 + tau[0]) % 1:.6f}    {(0.666667 + tau[1]) % 1:.6f}   {z2:.6f}
+    B    {tau0:.6f}    {tau1:.6f}   {z2:.6f}
+    N    {n2x:.6f}    {n2y:.6f}   {z2:.6f}
 
 K_POINTS (automatic)
     12 12 1 0 0 0
 """
 
-    with open(filename, 'w') as f:
-        f.write(qe_content)
+
+@dataclass(frozen=True, eq=False)
+class HBNConfig:
+    """
+    h-BN bilayer geometry for one stacking, shared by the CIF/POSCAR/QE writers.
+
+    Holds ndarrays, so instances compare and hash by identity.
+    """
+
+    tau: np.ndarray
+    a: float = HBN_A
+    c: float = HBN_C
+    interlayer: float = HBN_INTERLAYER
+    z1: float = field(init=False)
+    z2: float = field(init=False)
+    cell_xy: np.ndarray = field(init=False, repr=False)  # rows: a1, a2 (Cartesian x, y)
+    frac_pos: np.ndarray = field(init=False, repr=False)  # rows: B1, N1, B2, N2
+
+    def __post_init__(self):
+        object.__setattr__(self, 'tau', np.asarray(self.tau, float))
+
+        # Calculate z positions for centering the bilayer in the cell
+        z_center = 0.5
+        z_offset = self.interlayer / (2 * self.c)
+        z1 = z_center - z_offset  # First layer
+        z2 = z_center + z_offset  # Second layer
+
+        # Bottom layer at the monolayer sites, top layer shifted by tau (wrapped into [0,1))
+        shifted = np.mod(HBN_BASE_FRAC + self.tau, 1.0)
+        frac_pos = np.column_stack([np.vstack([HBN_BASE_FRAC, shifted]), [z1, z1, z2, z2]])
+
+        object.__setattr__(self, 'z1', z1)
+        object.__setattr__(self, 'z2', z2)
+        object.__setattr__(self, 'cell_xy', np.array([[self.a, 0.0],
+                                                      [-self.a / 2, self.a * SQRT3 / 2]]))
+        object.__setattr__(self, 'frac_pos', frac_pos)
+
+    def template_params(self, stacking_type, description):
+        """Values substituted into the CIF/POSCAR/QE templates"""
+        return dict(
+            stacking_type=stacking_type,
+            description=description,
+            date=GEN_TIME,
+            a=self.a, c=self.c, interlayer=self.interlayer,
+            a1x=self.cell_xy[0, 0], a2x=self.cell_xy[1, 0], a2y=self.cell_xy[1, 1],
+            z1=self.z1, z2=self.z2,
+            tau0=self.frac_pos[2, 0], tau1=self.frac_pos[2, 1],
+            n2x=self.frac_pos[3, 0], n2y=self.frac_pos[3, 1],
+        )
+
+
+def resolve_config(tau, config=None):
+    """
+    Geometry for a writer call: config with tau applied on top (tau wins when
+    both are given and differ), or a default HBNConfig for tau.
+    """
+    if config is None:
+        return HBNConfig(np.asarray(tau, float))
+    if tau is not None and not np.array_equal(tau, config.tau):
+        return replace(config, tau=np.asarray(tau, float))
+    return config
+
+
+def write_cif_file(filename, stacking_type, tau, description, config=None):
+    """
+    Write a DFT-ready CIF file for h-BN bilayer.
+    """
+
+    config = resolve_config(tau, config)
+    Path(filename).write_text(TEMPLATE_CIF.format_map(config.template_params(stacking_type, description)))
+
+    return config.a, config.c, config.interlayer
+
+
+def create_vasp_poscar(filename, stacking_type, tau, description, config=None):
+    """
+    Create VASP POSCAR file for h-BN bilayer.
+    """
+
+    config = resolve_config(tau, config)
+    Path(filename).write_text(TEMPLATE_POSCAR.format_map(config.template_params(stacking_type, description)))
+
+
+def create_quantum_espresso_input(filename, stacking_type, tau, description, config=None):
+    """
+    Create Quantum ESPRESSO input file template.
+    """
+
+    config = resolve_config(tau, config)
+    Path(filename).write_text(TEMPLATE_QE.format_map(config.template_params(stacking_type, description)))
 
 
 def main():
@@ -195,19 +233,22 @@ def main():
         print(f"Description: {config['description']}")
         print(f"Stacking vector τ: [{config['tau'][0]:.4f}, {config['tau'][1]:.4f}]")
 
+        # Geometry shared by all three writers
+        hbn = HBNConfig(config['tau'])
+
         # Create CIF file
         cif_file = f'hBN_{stacking}_DFT.cif'
-        a, c, d = write_cif_file(cif_file, stacking, config['tau'], config['description'])
+        a, c, d = write_cif_file(cif_file, stacking, config['tau'], config['description'], hbn)
         print(f"  ✓ Created: {cif_file}")
 
         # Create VASP POSCAR
         poscar_file = f'POSCAR_{stacking}'
-        create_vasp_poscar(poscar_file, stacking, config['tau'], config['description'])
+        create_vasp_poscar(poscar_file, stacking, config['tau'], config['description'], hbn)
         print(f"  ✓ Created: {poscar_file}")
 
         # Create QE input template
         qe_file = f'hBN_{stacking}.in'
-        create_quantum_espresso_input(qe_file, stacking, config['tau'], config['description'])
+        create_quantum_espresso_input(qe_file, stacking, config['tau'], config['description'], hbn)
         print(f"  ✓ Created: {qe_file}")
 
         print(f"\n  Structure parameters:")
@@ -3,11 +3,14 @@
 Create DFT-ready h-BN bilayer structures with proper cell parameters and vacuum
 """
 
+import math
 import numpy as np
 from ase import Atoms
 from ase.io import write
 from ase.build import make_supercell
 
+SQRT3 = math.sqrt(3.0)
+
 def create_hBN_bilayer_for_dft(stacking_type='AA', supercell_size=(1,1,1), vacuum=20.0):
     """
     Create DFT-ready h-BN bilayer structure.
@@ -24,7 +27,7 @@ def create_hBN_bilayer_for_dft(stacking_type='AA', supercell_size=(1,1,1), vacuu
 
     # Create hexagonal unit cell
     cell = [[a, 0, 0],
-            [-a/2, a*np.sqrt(3)/2, 0],
+            [-a/2, a*SQRT3/2, 0],
             [0, 0, c_spacing + vacuum]]
 
     # Define stacking vectors (in fractional coordinates)
@@ -36,20 +39,18 @@ def create_hBN_bilayer_for_dft(stacking_type='AA', supercell_size=(1,1,1), vacuu
 
     tau = tau_vectors.get(stacking_type, [0.0, 0.0])
 
-    # Layer 1 positions (fractional coordinates)
-    layer1_positions = [
-        [0.0, 0.0, 0.5 - c_spacing/(2*(c_spacing + vacuum))],  # B
-        [1/3, 2/3, 0.5 - c_spacing/(2*(c_spacing + vacuum))],  # N
-    ]
-
-    # Layer 2 positions (shifted by tau and raised by c_spacing)
-    layer2_positions = [
-        [tau[0], tau[1], 0.5 + c_spacing/(2*(c_spacing + vacuum))],  # B
-        [(1/3 + tau[0]) % 1.0, (2/3 + tau[1]) % 1.0, 0.5 + c_spacing/(2*(c_spacing + vacuum))],  # N
-    ]
-
-    # Combine positions
-    positions = layer1_positions + layer2_positions
+    # Half the interlayer distance as a fraction of c
+    z_half = c_spacing / (2.0 * (c_spacing + vacuum))
+
+    # Fractional positions: layer 1 (B, N), then layer 2 shifted by tau and raised by c_spacing
+    positions = np.array([
+        [0.0, 0.0, 0.5 - z_half],                    # B
+        [1/3, 2/3, 0.5 - z_half],                    # N
+        [tau[0], tau[1], 0.5 + z_half],              # B
+        [1/3 + tau[0], 2/3 + tau[1], 0.5 + z_half],  # N
+    ])
+    # Wrap in-plane coordinates to [0,1) the same way as sympol2d.builder.wrap01
+    positions[:, :2] -= np.floor(positions[:, :2])
 
     # Create atoms object
     atoms = Atoms('B2N2',
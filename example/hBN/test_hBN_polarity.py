@@ -3,10 +3,18 @@
 import sys
 sys.path.insert(0, '/home/amal/work/codes/slipmat')
 
-from sympol2d.symmetry import LayerGroupSymmetry
+from sympol2d.symmetry import get_symmetry
 from sympol2d.scanner import StackingScanner
 import numpy as np
 
+# Reference z-polar stacking vectors: AB (downward -P) and BA (upward +P)
+TAU_AB = (1/3, 1/3)
+TAU_BA = (2/3, 2/3)
+
+def _close(t, r, tol=0.01):
+    """Scalar |t - r| <= tol test for a 2-component stacking vector"""
+    return abs(t[0] - r[0]) <= tol and abs(t[1] - r[1]) <= tol
+
 def test_hBN_configurations():
     print("=" * 60)
     print("Testing h-BN Bilayer Polarity Predictions")
@@ -17,7 +25,7 @@ def test_hBN_configurations():
 
     # Create scanner to analyze symmetries
     scanner = StackingScanner(layer_group)
-    symmetry = LayerGroupSymmetry(layer_group)
+    symmetry = get_symmetry(layer_group)
 
     configurations = {
         'AA': {
@@ -37,9 +45,12 @@ def test_hBN_configurations():
         }
     }
 
+    # Classify every configuration in one vectorized pass
+    is_polar, _ = symmetry.classify_bulk([c['tau'] for c in configurations.values()])
+
     results = {}
 
-    for config_name, config_data in configurations.items():
+    for i, (config_name, config_data) in enumerate(configurations.items()):
         print(f"\nTesting {config_name} configuration ({config_data['description']}):")
         print("-" * 40)
 
@@ -51,7 +62,7 @@ def test_hBN_configurations():
         preserved_syms = symmetry.get_preserved_symmetries(tau)
 
         # Classify stacking
-        stacking_type = symmetry.classify_stacking(tau)
+        stacking_type = 'polar' if is_polar[i] else 'AA'
 
         # Determine polar direction
         if stacking_type == 'polar':
@@ -60,9 +71,9 @@ def test_hBN_configurations():
                 # For z-polar, we need to distinguish up vs down based on tau
                 # AB (tau ~ 1/3, 1/3) -> downward
                 # BA (tau ~ 2/3, 2/3) -> upward
-                if np.allclose(tau, [1/3, 1/3], atol=0.01):
+                if _close(tau, TAU_AB):
                     polar_status = "POLAR (z-direction, downward -P)"
-                elif np.allclose(tau, [2/3, 2/3], atol=0.01):
+                elif _close(tau, TAU_BA):
                     polar_status = "POLAR (z-direction, upward +P)"
                 else:
                     polar_status = f"POLAR ({polar_direction}-direction)"
@@ -81,9 +92,9 @@ def test_hBN_configurations():
         if config_name == 'AA':
             success = stacking_type != 'polar'
         elif config_name == 'AB':
-            success = stacking_type == 'polar' and polar_direction == 'z' and np.allclose(tau, [1/3, 1/3], atol=0.01)
+            success = stacking_type == 'polar' and polar_direction == 'z' and _close(tau, TAU_AB)
         elif config_name == 'BA':
-            success = stacking_type == 'polar' and polar_direction == 'z' and np.allclose(tau, [2/3, 2/3], atol=0.01)
+            success = stacking_type == 'polar' and polar_direction == 'z' and _close(tau, TAU_BA)
 
         results[config_name] = {
             'success': success,
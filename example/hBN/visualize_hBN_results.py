@@ -3,7 +3,7 @@
 import sys
 sys.path.insert(0, '/home/amal/work/codes/slipmat')
 
-from sympol2d.symmetry import LayerGroupSymmetry
+from sympol2d.symmetry import get_symmetry
 from sympol2d.scanner import StackingScanner
 import numpy as np
 import matplotlib.pyplot as plt
@@ -17,7 +17,7 @@ def visualize_hBN_validation():
     # h-BN has p-6m2 symmetry
     layer_group = 'p-6m2'
     scanner = StackingScanner(layer_group)
-    symmetry = LayerGroupSymmetry(layer_group)
+    symmetry = get_symmetry(layer_group)
 
     # Test configurations
     configs = {
@@ -51,10 +51,9 @@ def visualize_hBN_validation():
     y_pos = 0.9
     for name, data in configs.items():
         tau = data['tau']
-        preserved = symmetry.test_symmetry_preservation(tau)
-        broken_syms = symmetry.get_broken_symmetries(tau)
-        preserved_syms = symmetry.get_preserved_symmetries(tau)
-        stacking_type = symmetry.classify_stacking(tau)
+        stacking_type, preserved = symmetry.classify_and_get(tau)
+        broken_syms = [op for op, ok in preserved.items() if not ok]
+        preserved_syms = [op for op, ok in preserved.items() if ok]
 
         color = 'green' if stacking_type != 'polar' else data['color']
         text = f'{name}: {"NON-POLAR" if stacking_type != "polar" else "POLAR"}'
@@ -8,8 +8,17 @@ A tool for predicting polar and non-polar stacking configurations in
 __version__ = "0.1.0"
 __author__ = "SYMPOL2D Development Team"
 
-from . import cli
-from . import symmetry
-from . import scanner
-from . import c2db_interface
-from . import utils
\ No newline at end of file
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so running
+# the CLI for --help does not pull in NumPy
+_SUBMODULES = ('cli', 'symmetry', 'scanner', 'c2db_interface', 'utils')
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name == 'get_symmetry':
+        from .symmetry import get_symmetry
+        return get_symmetry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
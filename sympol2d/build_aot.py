@@ -0,0 +1,28 @@
+"""
+Ahead-of-time build of the SYMPOL2D scan kernel
+
+Compiles scanner._survivor_mask_loop into the extension module
+sympol2d._kernels, so the CLI does not pay numba's JIT compile on its
+first scan. Run once per Python/NumPy ABI after installing:
+
+    python -m sympol2d.build_aot
+"""
+
+import os
+
+from numba.pycc import CC
+
+from .scanner import _survivor_mask_loop
+
+
+def build(output_dir=None):
+    """Compile sympol2d._kernels into output_dir (default: the package directory)"""
+    cc = CC('_kernels')
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.export('survivor_mask', 'b1[:, :](f8[:, :], f8[:, :, :], f8)')(_survivor_mask_loop)
+    cc.compile()
+    return cc.output_dir
+
+
+if __name__ == '__main__':
+    print(f"Built sympol2d._kernels in {build()}")
@@ -0,0 +1,31 @@
+"""
+Precomputed survivor masks for the default SYMPOL2D scan
+
+Writes sympol2d/_survivor_tables.npz with the scan_for_z survivor mask of
+every layer group on the default grid, so the CLI reads the mask instead of
+testing every grid point. Tables that no longer match the operator matrices
+are ignored at runtime; re-run after changing OPER or LAYER_GROUP_OPERATIONS:
+
+    python -m sympol2d.build_tables
+"""
+
+import numpy as np
+
+from .scanner import SURVIVOR_TABLES, grid_points, survivor_mask, _group_operators
+from .symmetry import LAYER_GROUP_OPERATIONS
+
+
+def build(path=SURVIVOR_TABLES, ngrid=60, atol=1e-8):
+    """Write the survivor mask of every layer group on an ngrid×ngrid grid to path"""
+    pts = grid_points(ngrid)
+    arrays = {"ngrid": ngrid, "atol": atol}
+    for layer_group in LAYER_GROUP_OPERATIONS:
+        _, e_plus_r = _group_operators(layer_group)
+        arrays[f"mask:{layer_group}"] = survivor_mask(pts, e_plus_r, atol)
+        arrays[f"e_plus_r:{layer_group}"] = e_plus_r
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+if __name__ == '__main__':
+    print(f"Built survivor tables in {build()}")
@@ -3,6 +3,7 @@ Bilayer structure builder for SYMPOL2D
 """
 
 import numpy as np
+from functools import lru_cache
 
 
 def wrap01(x):
@@ -10,6 +11,17 @@ def wrap01(x):
     return x - np.floor(x)
 
 
+@lru_cache(maxsize=32)
+def _format_lattice(lattice_flat):
+    """POSCAR lattice block for a flat 9-tuple of lattice components (shared by AB/BA)"""
+    return ("  %18.12f  %18.12f  %18.12f\n" * 3) % lattice_flat
+
+
+def _format_coords(coords):
+    """POSCAR coordinate block for an N×3 array, rendered by one %-format call"""
+    return ("  %.12f  %.12f  %.12f\n" * coords.shape[0]) % tuple(coords.ravel().tolist())
+
+
 def make_bilayer_poscar(formula, lattice, frac_coords_mono, tau, dz_frac,
                         comment="bilayer", top_first=False):
     """
@@ -27,29 +39,42 @@ def make_bilayer_poscar(formula, lattice, frac_coords_mono, tau, dz_frac,
     Returns:
         str: Complete POSCAR content
     """
-    bottom = np.array(frac_coords_mono, float)
-    top = np.array(frac_coords_mono, float)
-
-    # Apply in-plane shift to top layer
-    top[:, 0] = wrap01(top[:, 0] + tau[0])
-    top[:, 1] = wrap01(top[:, 1] + tau[1])
-
-    # Apply vertical shift to top layer
-    top[:, 2] = wrap01(top[:, 2] + dz_frac)
-
-    # Stack layers
-    coords = np.vstack([top, bottom]) if top_first else np.vstack([bottom, top])
-
-    # Build POSCAR content
-    lines = []
-    lines.append(f"{comment}")
-    lines.append("1.0")
-    for v in lattice:
-        lines.append(f"  {v[0]:18.12f}  {v[1]:18.12f}  {v[2]:18.12f}")
-    lines.append(formula)
-    lines.append(str(coords.shape[0]))
-    lines.append("Direct")
-    for r in coords:
-        lines.append(f"  {r[0]:.12f}  {r[1]:.12f}  {r[2]:.12f}")
-
-    return "\n".join(lines) + "\n"
+    return make_bilayer_poscars(formula, lattice, frac_coords_mono, [tau], dz_frac,
+                                [comment], top_first=top_first)[0]
+
+
+def make_bilayer_poscars(formula, lattice, frac_coords_mono, taus, dz_frac,
+                         comments, top_first=False):
+    """
+    Build several rigid bilayer POSCARs that differ only in tau (e.g., AB and BA).
+
+    Args:
+        formula: Chemical formula string (e.g., "MoS2", "BN")
+        lattice: 3×3 lattice vectors in Angstroms
+        frac_coords_mono: N×3 fractional coordinates of monolayer atoms
+        taus: K in-plane shifts [tau_x, tau_y] for the top layer (fractional)
+        dz_frac: Fractional vertical offset between layers
+        comments: K comment lines, one per tau
+        top_first: If True, list top-layer atoms first (for visualization)
+
+    Returns:
+        list of K str: Complete POSCAR contents, in the order of taus
+    """
+    # Bottom layer is the monolayer itself; vstack below copies it, so no copy here
+    bottom = np.asarray(frac_coords_mono, dtype=np.float64)
+
+    # All K top layers in one broadcast: (K,1,3) shifts + (N,3) monolayer -> (K,N,3)
+    shifts = np.array([(t[0], t[1], dz_frac) for t in taus], dtype=np.float64)
+    tops = wrap01(bottom + shifts[:, None, :])
+
+    # Everything but the comment and coordinates is shared by the K files
+    lattice_block = _format_lattice(tuple(np.ravel(lattice).tolist()))
+    counts_block = f"{formula}\n{2 * bottom.shape[0]}\nDirect\n"
+
+    poscars = []
+    for comment, top in zip(comments, tops):
+        # Stack layers
+        coords = np.vstack([top, bottom]) if top_first else np.vstack([bottom, top])
+        poscars.append("".join((f"{comment}\n1.0\n", lattice_block, counts_block,
+                                _format_coords(coords))))
+    return poscars
@@ -2,13 +2,61 @@
 Interface to c2db database for material extraction
 """
 
+import os
+import re
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
 import json
 
 
+# Formula part of a c2db UID: text before the first '-', minus one leading digit
+# (e.g., '1MoS2-3' -> 'MoS2'); UIDs without '-' do not match
+UID_FORMULA_RE = re.compile(r'^\d?([^-]*)-')
+
+# Leading count and remainder of the text before the first '-' of a UID
+# (e.g., '4P-1' -> ('4', 'P')), used for the CLI formula 'P4'
+UID_COUNT_FORMULA_RE = re.compile(r'^(\d*)([^-]*)')
+
+# Connection tuning for the read-mostly c2db workload: memory-mapped I/O,
+# a 64 MB page cache and in-memory temp tables. synchronous stays at its
+# default so the one-off index creation in _ensure_indexes is crash-safe
+READ_PRAGMAS = """
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+"""
+
+# Byte width of one stored atomic number → dtype of the numbers blob
+NUMBERS_DTYPE_BY_SIZE = {4: np.dtype('<i4'), 8: np.dtype('<i8')}
+
+# Chemical symbol indexed by atomic number (index 0 is a placeholder)
+ATOMIC_SYMBOLS = (
+    'X',
+    'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne',
+    'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar',
+    'K', 'Ca', 'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe',
+    'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Ge', 'As', 'Se',
+    'Br', 'Kr', 'Rb', 'Sr', 'Y', 'Zr', 'Nb', 'Mo',
+    'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn',
+    'Sb', 'Te', 'I', 'Xe', 'Cs', 'Ba', 'La', 'Ce',
+    'Pr', 'Nd', 'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy',
+    'Ho', 'Er', 'Tm', 'Yb', 'Lu', 'Hf', 'Ta', 'W',
+    'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb',
+    'Bi', 'Po', 'At', 'Rn', 'Fr', 'Ra', 'Ac', 'Th',
+    'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf',
+)
+
+
+def _formula_from_uid(uid: str) -> str:
+    """Formula part of a c2db UID (e.g., '1MoS2-3' -> 'MoS2'); the UID itself if no '-'"""
+    match = UID_FORMULA_RE.match(uid)
+    return match.group(1) if match else uid
+
+
 @dataclass
 class Material2D:
     """Represents a 2D material from c2db"""
@@ -17,45 +65,172 @@ class Material2D:
     layer_group: str
     lattice: np.ndarray  # 3x3 matrix
     positions: np.ndarray  # Nx3 atomic positions
-    numbers: np.ndarray  # Atomic numbers
+    numbers: np.ndarray  # Atomic numbers (uint8)
     natoms: int
+    _inv_lattice: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
     
     def __repr__(self):
         return f"Material2D({self.formula}, {self.layer_group})"
     
+    @property
+    def inv_lattice(self) -> np.ndarray:
+        """Inverse of the lattice matrix (computed on first access)"""
+        if self._inv_lattice is None:
+            self._inv_lattice = np.linalg.inv(self.lattice)
+        return self._inv_lattice
+    
     def get_chemical_symbols(self):
         """Get chemical symbols from atomic numbers"""
-        # Simple atomic number to symbol mapping
-        ATOMIC_SYMBOLS = {
-            1: 'H', 2: 'He', 3: 'Li', 4: 'Be', 5: 'B', 6: 'C', 7: 'N', 8: 'O', 9: 'F', 10: 'Ne',
-            11: 'Na', 12: 'Mg', 13: 'Al', 14: 'Si', 15: 'P', 16: 'S', 17: 'Cl', 18: 'Ar',
-            19: 'K', 20: 'Ca', 21: 'Sc', 22: 'Ti', 23: 'V', 24: 'Cr', 25: 'Mn', 26: 'Fe',
-            27: 'Co', 28: 'Ni', 29: 'Cu', 30: 'Zn', 31: 'Ga', 32: 'Ge', 33: 'As', 34: 'Se',
-            35: 'Br', 36: 'Kr', 37: 'Rb', 38: 'Sr', 39: 'Y', 40: 'Zr', 41: 'Nb', 42: 'Mo',
-            43: 'Tc', 44: 'Ru', 45: 'Rh', 46: 'Pd', 47: 'Ag', 48: 'Cd', 49: 'In', 50: 'Sn',
-            51: 'Sb', 52: 'Te', 53: 'I', 54: 'Xe', 55: 'Cs', 56: 'Ba', 57: 'La', 58: 'Ce',
-            59: 'Pr', 60: 'Nd', 61: 'Pm', 62: 'Sm', 63: 'Eu', 64: 'Gd', 65: 'Tb', 66: 'Dy',
-            67: 'Ho', 68: 'Er', 69: 'Tm', 70: 'Yb', 71: 'Lu', 72: 'Hf', 73: 'Ta', 74: 'W',
-            75: 'Re', 76: 'Os', 77: 'Ir', 78: 'Pt', 79: 'Au', 80: 'Hg', 81: 'Tl', 82: 'Pb',
-            83: 'Bi', 84: 'Po', 85: 'At', 86: 'Rn', 87: 'Fr', 88: 'Ra', 89: 'Ac', 90: 'Th',
-            91: 'Pa', 92: 'U', 93: 'Np', 94: 'Pu', 95: 'Am', 96: 'Cm', 97: 'Bk', 98: 'Cf'
-        }
-        return [ATOMIC_SYMBOLS.get(int(num), f'X{int(num)}') for num in self.numbers]
+        return [ATOMIC_SYMBOLS[z] if 0 < z < len(ATOMIC_SYMBOLS) else f'X{z}'
+                for z in self.numbers.tolist()]
 
 
 class C2DBInterface:
-    """Interface to c2db SQLite database"""
+    """
+    Interface to c2db SQLite database.
+    
+    Use as a context manager (``with C2DBInterface(path) as db: ...``) or call
+    close() explicitly to release the connection.
+    """
+    
+    # Fixed SQL text, shared by every instance so sqlite's statement cache hits
+    MATERIAL_QUERY = """
+        SELECT lg.value, s.cell, s.positions, s.numbers, s.natoms
+        FROM text_key_values u
+        JOIN systems s ON s.id = u.id
+        LEFT JOIN text_key_values lg ON lg.id = u.id AND lg.key = 'layergroup'
+        WHERE u.key = 'uid' AND u.value = ?
+        """
+    MATERIALS_QUERY = """
+        SELECT u.value, lg.value, s.cell, s.positions, s.numbers, s.natoms
+        FROM text_key_values u
+        JOIN systems s ON s.id = u.id
+        LEFT JOIN text_key_values lg ON lg.id = u.id AND lg.key = 'layergroup'
+        WHERE u.key = 'uid' AND u.value IN ({placeholders})
+        """
+    SEARCH_ALL_QUERY = """
+        SELECT DISTINCT t1.value as uid, t2.value as layergroup
+        FROM text_key_values t1
+        JOIN text_key_values t2 ON t1.id = t2.id AND t2.key = 'layergroup'
+        WHERE t1.key = 'uid'
+        ORDER BY t1.value
+        LIMIT ?
+        """
+    SEARCH_FORMULA_QUERY = """
+        SELECT t1.value as uid, t2.value as layergroup
+        FROM {uid_source}
+        LEFT JOIN text_key_values t2 ON t2.id = t1.id AND t2.key = 'layergroup'
+        WHERE {uid_match}
+        ORDER BY t1.value
+        LIMIT ?
+        """
+    SEARCH_LAYER_GROUP_QUERY = """
+        SELECT DISTINCT t1.value as uid, t2.value as layergroup
+        FROM text_key_values t1
+        JOIN text_key_values t2 ON t1.id = t2.id
+        WHERE t1.key = 'uid' AND t2.key = 'layergroup' AND t2.value = ?
+        ORDER BY t1.value
+        LIMIT ?
+        """
+    SEARCH_FORMULA_LAYER_GROUP_QUERY = """
+        SELECT DISTINCT t1.value as uid, t2.value as layergroup
+        FROM {uid_source}
+        JOIN text_key_values t2 ON t1.id = t2.id
+        WHERE {uid_match} AND t2.key = 'layergroup' AND t2.value = ?
+        ORDER BY t1.value
+        LIMIT ?
+        """
+    
+    # 'exact' and 'prefix' compare formula with the formula part of the UID,
+    # which may follow one leading digit ('1MoS2-3'): one [low, high) UID range
+    # per possible lead, each answered from the (key, value, id) index
+    UID_LEADS = ('',) + tuple('0123456789')
+    UID_RANGES_SOURCE = (
+        "(VALUES " + ", ".join(["(?, ?)"] * len(UID_LEADS)) + ") AS bounds "
+        "JOIN text_key_values t1 "
+        "ON t1.value >= bounds.column1 AND t1.value < bounds.column2")
+    
+    # (FROM source, UID condition) per search_materials match_mode;
+    # 'substring' has to scan
+    UID_MATCH = {
+        'exact': (UID_RANGES_SOURCE, "t1.key = 'uid'"),
+        'prefix': (UID_RANGES_SOURCE, "t1.key = 'uid'"),
+        'substring': ("text_key_values t1", "t1.key = 'uid' AND t1.value LIKE ?"),
+    }
+    LAYER_GROUPS_QUERY = """
+        SELECT value, COUNT(*) as count
+        FROM text_key_values
+        WHERE key = 'layergroup'
+        GROUP BY value
+        ORDER BY count DESC
+        """
+    
+    # (name, columns) of covering indexes on text_key_values; (key, value, id)
+    # answers uid/layergroup lookups and the layer-group GROUP BY, (id, key, value)
+    # the per-system layergroup join, both without touching the table
+    INDEXES = (
+        ('idx_tkv_key_value_id', 'key, value, id'),
+        ('idx_tkv_id_key_value', 'id, key, value'),
+    )
     
-    def __init__(self, db_path: str = 'c2db.db'):
-        """Initialize connection to c2db database"""
+    # SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds is 999
+    MAX_SQL_PARAMS = 900
+    
+    # Rows per fetchmany() when streaming result sets
+    FETCH_SIZE = 256
+    
+    def __init__(self, db_path: str = 'c2db.db', precision: str = 'f8'):
+        """
+        Initialize connection to c2db database.
+        
+        Args:
+            db_path: Path to c2db.db file
+            precision: dtype for lattice/positions of loaded materials; 'f8'
+                (default) keeps full double precision, 'f4' halves their size
+        """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.precision = np.dtype(precision)
+        # Autocommit (no implicit BEGIN) and room for every fixed query text in
+        # the prepared-statement cache
+        self.conn = sqlite3.connect(db_path, check_same_thread=False,
+                                    cached_statements=256, isolation_level=None)
+        self.conn.executescript(READ_PRAGMAS)
         self.cursor = self.conn.cursor()
+        self.cursor.arraysize = self.FETCH_SIZE
+        self._ensure_indexes()
+        # Nothing below writes; reject accidental writes from here on
+        self.conn.execute("PRAGMA query_only=1")
     
-    def __del__(self):
+    def _ensure_indexes(self):
+        """
+        Create the text_key_values indexes used by UID/layer-group lookups.
+        
+        Runs once per database file: the indexes persist, and ANALYZE is only
+        issued when they are first created. Read-only databases are left as-is.
+        """
+        existing = {name for (name,) in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'text_key_values'")}
+        if existing.issuperset(name for name, _ in self.INDEXES):
+            return
+        try:
+            with self.conn:
+                for name, columns in self.INDEXES:
+                    self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON text_key_values({columns})")
+                self.conn.execute("ANALYZE")
+        except sqlite3.OperationalError:
+            # Read-only database (or missing table): lookups still work, just unindexed
+            pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def close(self):
         """Close database connection"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        self.conn.close()
     
     def get_material_by_uid(self, uid: str) -> Optional[Material2D]:
         """
@@ -67,31 +242,68 @@ class C2DBInterface:
         Returns:
             Material2D object or None if not found
         """
-        # First get the system data
-        query = """
-        SELECT s.id, s.cell, s.positions, s.numbers, s.natoms
-        FROM systems s
-        JOIN text_key_values t ON s.id = t.id
-        WHERE t.key = 'uid' AND t.value = ?
-        """
-        
-        self.cursor.execute(query, (uid,))
+        # System data and layer group in one round-trip
+        self.cursor.execute(self.MATERIAL_QUERY, (uid,))
         result = self.cursor.fetchone()
         
         if not result:
             print(f"Material with uid '{uid}' not found")
             return None
         
-        system_id, cell_blob, pos_blob, num_blob, natoms_raw = result
+        layer_group, cell_blob, pos_blob, num_blob, natoms_raw = result
         
-        # Get additional properties
-        self.cursor.execute("""
-        SELECT key, value FROM text_key_values 
-        WHERE id = ? AND key IN ('layergroup', 'uid')
-        """, (system_id,))
+        return self._material_from_row(uid, layer_group or 'p1',
+                                       cell_blob, pos_blob, num_blob, natoms_raw)
+    
+    def get_materials_by_uids(self, uids: List[str], max_workers: int = 4) -> Dict[str, Material2D]:
+        """
+        Retrieve several materials with one query per batch of UIDs.
+        
+        Args:
+            uids: Unique identifiers (e.g., ['1MoS2-3', '4P-1'])
+            max_workers: Threads used when there is more than one batch; each
+                thread reads through its own connection
+            
+        Returns:
+            Dictionary mapping each UID found in the database to its Material2D
+        """
+        uids = list(dict.fromkeys(uids))
         
-        properties = dict(self.cursor.fetchall())
+        # Stay below SQLite's default limit on bound parameters
+        batches = [uids[start:start + self.MAX_SQL_PARAMS]
+                   for start in range(0, len(uids), self.MAX_SQL_PARAMS)]
         
+        if len(batches) <= 1 or max_workers <= 1:
+            chunks = [self._fetch_material_rows(self.conn, batch) for batch in batches]
+        else:
+            # sqlite3 releases the GIL while stepping, so batches overlap
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+                chunks = list(pool.map(self._fetch_material_rows_own_connection, batches))
+        
+        materials = {}
+        for rows in chunks:
+            for uid, layer_group, cell_blob, pos_blob, num_blob, natoms_raw in rows:
+                materials[uid] = self._material_from_row(uid, layer_group or 'p1',
+                                                         cell_blob, pos_blob, num_blob, natoms_raw)
+        
+        return materials
+    
+    def _fetch_material_rows(self, conn, batch):
+        """Rows of MATERIALS_QUERY for one batch of UIDs"""
+        query = self.MATERIALS_QUERY.format(placeholders=','.join('?' * len(batch)))
+        return conn.execute(query, batch).fetchall()
+    
+    def _fetch_material_rows_own_connection(self, batch):
+        """_fetch_material_rows on a private connection (connections are not shared across threads)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executescript(READ_PRAGMAS)
+            return self._fetch_material_rows(conn, batch)
+        finally:
+            conn.close()
+    
+    def _material_from_row(self, uid, layer_group, cell_blob, pos_blob, num_blob, natoms_raw) -> Material2D:
+        """Decode the binary columns of a systems row into a Material2D"""
         # Parse binary data
         if isinstance(natoms_raw, bytes):
             # Handle packed natoms if needed
@@ -99,33 +311,25 @@ class C2DBInterface:
         else:
             natoms = natoms_raw
             
-        lattice = np.frombuffer(cell_blob, dtype=float).reshape(3, 3)
-        positions = np.frombuffer(pos_blob, dtype=float).reshape(-1, 3)
+        # ASE stores little-endian doubles; with precision='f8' these stay
+        # zero-copy views of the blobs
+        lattice = np.frombuffer(cell_blob, dtype='<f8').reshape(3, 3).astype(self.precision, copy=False)
+        positions = np.frombuffer(pos_blob, dtype='<f8').reshape(-1, 3).astype(self.precision, copy=False)
         
-        # Handle atomic numbers - they might be stored as int32 or int64
-        try:
-            numbers = np.frombuffer(num_blob, dtype=np.int32)
-        except:
-            try:
-                numbers = np.frombuffer(num_blob, dtype=np.int64)
-            except:
-                # Fallback - assume one atom type
-                numbers = np.ones(natoms, dtype=int)
+        # Atomic numbers are stored as int32 or int64; the blob size per atom tells which
+        itemsize = len(num_blob) // natoms if natoms else 0
+        numbers = np.frombuffer(num_blob, dtype=NUMBERS_DTYPE_BY_SIZE.get(itemsize, np.dtype('<i8')))
+        # Z <= 118 always fits in one byte
+        numbers = numbers.astype(np.uint8)
         
-        # Extract formula from uid (e.g., '1MoS2-3' -> 'MoS2')
-        formula = uid
-        if '-' in uid:
-            parts = uid.split('-')
-            if len(parts[0]) > 0 and parts[0][0].isdigit():
-                # Remove leading digit
-                formula = parts[0][1:]
-            else:
-                formula = parts[0]
+        # Same read-only contract whether or not the arrays alias the blobs
+        for arr in (lattice, positions, numbers):
+            arr.flags.writeable = False
         
         return Material2D(
             uid=uid,
-            formula=formula,
-            layer_group=properties.get('layergroup', 'p1'),
+            formula=_formula_from_uid(uid),
+            layer_group=layer_group,
             lattice=lattice,
             positions=positions,
             numbers=numbers,
@@ -134,7 +338,9 @@ class C2DBInterface:
     
     def search_materials(self, formula: Optional[str] = None, 
                         layer_group: Optional[str] = None,
-                        limit: int = 10) -> List[Dict[str, str]]:
+                        limit: int = 10,
+                        include_system: bool = False,
+                        match_mode: str = 'substring') -> List[Dict]:
         """
         Search for materials by formula or layer group.
         
@@ -142,98 +348,155 @@ class C2DBInterface:
             formula: Chemical formula (e.g., 'MoS2')
             layer_group: Layer group symbol (e.g., 'p-4m2')
             limit: Maximum number of results
+            include_system: If True, also load each hit's structure into a
+                'material' entry (Material2D) with one batched query, instead
+                of one get_material_by_uid call per hit
+            match_mode: How formula is matched: 'substring' (default) searches
+                the whole UID; 'prefix' and 'exact' compare with the formula
+                part of the UID ('MoS2' matches '1MoS2-1' and '2MoS2-3') and
+                use the index
             
         Returns:
-            List of material info dictionaries
+            List of material info dictionaries, ordered by UID
         """
-        conditions = []
-        params = []
+        if match_mode not in self.UID_MATCH:
+            raise ValueError(f"Unsupported match_mode: {match_mode}")
         
         if formula:
-            conditions.append("t1.key = 'uid' AND t1.value LIKE ?")
-            params.append(f'%{formula}%')
-        
-        if layer_group:
-            conditions.append("t2.key = 'layergroup' AND t2.value = ?")
-            params.append(layer_group)
+            if match_mode == 'substring':
+                uid_params = (f'%{formula}%',)
+            else:
+                uid_params = self._uid_bounds(formula, exact=(match_mode == 'exact'))
+            uid_source, uid_match = self.UID_MATCH[match_mode]
         
-        if not conditions:
-            # Get some samples if no criteria specified
-            query = """
-            SELECT DISTINCT t1.value as uid, t2.value as layergroup
-            FROM text_key_values t1
-            JOIN text_key_values t2 ON t1.id = t2.id AND t2.key = 'layergroup'
-            WHERE t1.key = 'uid'
-            LIMIT ?
-            """
-            params = [limit]
+        # Pick one of the fixed query texts so the prepared statement is reused
+        if formula and layer_group:
+            query = self.SEARCH_FORMULA_LAYER_GROUP_QUERY.format(uid_source=uid_source, uid_match=uid_match)
+            params = (*uid_params, layer_group, limit)
+        elif formula:
+            query = self.SEARCH_FORMULA_QUERY.format(uid_source=uid_source, uid_match=uid_match)
+            params = (*uid_params, limit)
+        elif layer_group:
+            query = self.SEARCH_LAYER_GROUP_QUERY
+            params = (layer_group, limit)
         else:
-            if formula and layer_group:
-                query = f"""
-                SELECT DISTINCT t1.value as uid, t2.value as layergroup
-                FROM text_key_values t1
-                JOIN text_key_values t2 ON t1.id = t2.id
-                WHERE {' AND '.join(conditions)}
-                LIMIT ?
-                """
-            elif formula:
-                query = """
-                SELECT DISTINCT t1.value as uid, 
-                       (SELECT value FROM text_key_values WHERE id = t1.id AND key = 'layergroup') as layergroup
-                FROM text_key_values t1
-                WHERE t1.key = 'uid' AND t1.value LIKE ?
-                LIMIT ?
-                """
-            else:  # layer_group only
-                query = """
-                SELECT DISTINCT t1.value as uid, t2.value as layergroup
-                FROM text_key_values t1
-                JOIN text_key_values t2 ON t1.id = t2.id
-                WHERE t1.key = 'uid' AND t2.key = 'layergroup' AND t2.value = ?
-                LIMIT ?
-                """
-            params.append(limit)
+            # Get some samples if no criteria specified
+            query = self.SEARCH_ALL_QUERY
+            params = (limit,)
         
-        self.cursor.execute(query, params)
-        results = []
+        cursor = self.conn.cursor()
+        cursor.arraysize = self.FETCH_SIZE
+        cursor.execute(query, params)
         
-        for row in self.cursor.fetchall():
-            uid = row[0]
-            # Extract formula from uid
-            formula_extracted = uid
-            if '-' in uid:
-                parts = uid.split('-')
-                if len(parts[0]) > 0 and parts[0][0].isdigit():
-                    formula_extracted = parts[0][1:]
-                else:
-                    formula_extracted = parts[0]
-            
-            results.append({
-                'uid': uid,
-                'formula': formula_extracted,
-                'layer_group': row[1] or 'Unknown'
-            })
+        # Rows are (uid, layergroup)
+        results = [{'uid': uid,
+                    'formula': _formula_from_uid(uid),
+                    'layer_group': layergroup or 'Unknown'}
+                   for rows in iter(cursor.fetchmany, []) for uid, layergroup in rows]
+        
+        if include_system and results:
+            materials = self.get_materials_by_uids([r['uid'] for r in results])
+            for r in results:
+                r['material'] = materials.get(r['uid'])
         
         return results
     
+    def _uid_bounds(self, formula: str, exact: bool) -> Tuple[str, ...]:
+        """Flat (low, high) UID bounds, one pair per UID_LEADS entry, of UIDs whose formula part is (exact) or starts with formula"""
+        bounds = []
+        for lead in self.UID_LEADS:
+            low = lead + formula + ('-' if exact else '')
+            # Formula parts never contain '-', and in '2X-1' the formula is 'X':
+            # such leads get an empty range
+            if '-' in formula or (not lead and formula[:1].isdigit()):
+                bounds += (low, low)
+            else:
+                bounds += (low, low + '\uffff')
+        return tuple(bounds)
+    
+    def iter_layer_groups(self) -> Iterator[Tuple[str, int]]:
+        """Yield (layer group, count) pairs, fetching FETCH_SIZE rows at a time"""
+        # Own cursor, so other queries may run while the generator is suspended
+        cursor = self.conn.cursor()
+        cursor.arraysize = self.FETCH_SIZE
+        cursor.execute(self.LAYER_GROUPS_QUERY)
+        for rows in iter(cursor.fetchmany, []):
+            yield from rows
+    
     def get_all_layer_groups(self) -> List[Tuple[str, int]]:
-        """Get all unique layer groups and their counts"""
-        query = """
-        SELECT value, COUNT(*) as count
-        FROM text_key_values
-        WHERE key = 'layergroup'
-        GROUP BY value
-        ORDER BY count DESC
         """
+        Get all unique layer groups and their counts.
+        
+        The result is cached in a '<db>.layergroups.json' file next to the
+        database and reused for as long as the database mtime is unchanged.
+        """
+        db_path = os.fspath(self.db_path)
+        cache_path = db_path + '.layergroups.json'
+        try:
+            mtime_ns = os.stat(db_path).st_mtime_ns
+        except OSError:
+            return list(self.iter_layer_groups())
+        
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if cached['mtime_ns'] == mtime_ns:
+                return [tuple(row) for row in cached['layer_groups']]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        layer_groups = list(self.iter_layer_groups())
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump({'mtime_ns': mtime_ns, 'layer_groups': layer_groups}, f)
+        except OSError:
+            # Read-only location: just skip the cache
+            pass
+        return layer_groups
 
-        self.cursor.execute(query)
-        return self.cursor.fetchall()
+
+# UID → layer group in a single self-join (systems without a layergroup give p1)
+UID_LAYERGROUP_QUERY = """
+    SELECT t1.value, t2.value
+    FROM text_key_values t1
+    LEFT JOIN text_key_values t2 ON t2.id = t1.id AND t2.key = 'layergroup'
+    WHERE t1.key = 'uid' AND t1.value {}
+"""
+
+
+def _uid_to_formula(uid: str) -> str:
+    """Formula used by the CLI (e.g., '4P-1' -> 'P4')"""
+    count, element = UID_COUNT_FORMULA_RE.match(uid).groups()
+    # Handle leading digits: '4P' -> 'P4'
+    return element + count if element else count
+
+
+@lru_cache(maxsize=4)
+def open_db(db_path: str) -> C2DBInterface:
+    """
+    Shared C2DBInterface for a database path, kept open for the process.
+
+    Repeated lookups (CLI UID resolution, then structure export) reuse one
+    connection and its warm page cache. Do not close() the returned instance.
+    """
+    return C2DBInterface(db_path)
+
+
+@lru_cache(maxsize=1024)
+def _uid_record(uid: str, dbpath: str) -> Tuple[str, str, str]:
+    """(uid, formula, layer_group) of a UID; raises KeyError if absent, which is not cached"""
+    result = open_db(dbpath).conn.execute(UID_LAYERGROUP_QUERY.format("= ?"), (uid,)).fetchone()
+    if not result:
+        raise KeyError(uid)
+    return uid, _uid_to_formula(uid), result[1] or "p1"
 
 
 def fetch_by_uid(uid: str, dbpath: str = "raw/c2db.db") -> Optional[Dict]:
     """
     Fetch material info by UID for the new CLI interface.
 
+    Found UIDs are memoized per (uid, dbpath); each call returns a new dict.
+
     Args:
         uid: C2DB unique identifier (e.g., '4P-1')
         dbpath: Path to c2db.db file
@@ -241,58 +504,57 @@ def fetch_by_uid(uid: str, dbpath: str = "raw/c2db.db") -> Optional[Dict]:
     Returns:
         Dictionary with 'uid', 'formula', 'layer_group' keys, or None if not found
     """
-    import os
-    import sqlite3
-
     if not os.path.exists(dbpath):
         return None
 
     try:
-        conn = sqlite3.connect(dbpath)
-        cursor = conn.cursor()
+        uid, formula, layer_group = _uid_record(uid, dbpath)
+    except KeyError:
+        return None
+    except Exception as e:
+        print(f"Error fetching UID {uid}: {e}")
+        return None
 
-        # Get system ID from UID
-        cursor.execute("""
-            SELECT id FROM text_key_values
-            WHERE key = 'uid' AND value = ?
-        """, (uid,))
+    return {
+        "uid": uid,
+        "formula": formula,
+        "layer_group": layer_group
+    }
 
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return None
 
-        system_id = result[0]
-
-        # Get layer group
-        cursor.execute("""
-            SELECT value FROM text_key_values
-            WHERE id = ? AND key = 'layergroup'
-        """, (system_id,))
-
-        lg_result = cursor.fetchone()
-        layer_group = lg_result[0] if lg_result else "p1"
-
-        # Extract formula from uid (e.g., '4P-1' -> 'P4')
-        formula = uid.split('-')[0] if '-' in uid else uid
-        # Handle leading digit: '4P' -> 'P4'
-        if formula and formula[0].isdigit():
-            i = 0
-            while i < len(formula) and formula[i].isdigit():
-                i += 1
-            if i < len(formula):
-                count = formula[:i]
-                element = formula[i:]
-                formula = element + count
-
-        conn.close()
-
-        return {
-            "uid": uid,
-            "formula": formula,
-            "layer_group": layer_group
-        }
+def fetch_by_uids(uids: List[str], dbpath: str = "raw/c2db.db") -> Dict[str, Dict]:
+    """
+    Fetch material info for many UIDs, one query per batch of UIDs.
+
+    Args:
+        uids: C2DB unique identifiers (e.g., ['4P-1', '1MoS2-1'])
+        dbpath: Path to c2db.db file
+
+    Returns:
+        Dictionary mapping each UID found to a fetch_by_uid-style record
+    """
+    if not os.path.exists(dbpath):
+        return {}
+
+    uids = list(dict.fromkeys(uids))
+    records = {}
+    batch_size = C2DBInterface.MAX_SQL_PARAMS
+
+    try:
+        conn = open_db(dbpath).conn
+        for start in range(0, len(uids), batch_size):
+            batch = uids[start:start + batch_size]
+            query = UID_LAYERGROUP_QUERY.format(f"IN ({','.join('?' * len(batch))})")
+            for uid, layer_group in conn.execute(query, batch):
+                # Keep the first row per UID, as fetch_by_uid does
+                if uid not in records:
+                    records[uid] = {
+                        "uid": uid,
+                        "formula": _uid_to_formula(uid),
+                        "layer_group": layer_group or "p1"
+                    }
 
     except Exception as e:
-        print(f"Error fetching UID {uid}: {e}")
-        return None
\ No newline at end of file
+        print(f"Error fetching UIDs: {e}")
+
+    return records
@@ -3,11 +3,20 @@ CIF writer module for generating bilayer structures
 """
 
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
 from .c2db_interface import Material2D
+from .utils import cart_to_frac
+
+
+# One atom_site row: label, type symbol, fractional x/y/z, occupancy
+ATOM_ROW_FMT = "%-8s %-2s %10.6f %10.6f %10.6f 1.0\n"
+
+# Concurrent file writes in save_all_stackings_cif
+WRITE_WORKERS = 4
 
 
 @dataclass
@@ -18,39 +27,37 @@ class StackingConfiguration:
     polar_direction: Optional[str] = None
 
 
-def generate_bilayer_cif(material: Material2D, stacking: StackingConfiguration, 
-                        stacking_name: str = "bilayer") -> str:
+@dataclass
+class BilayerCIFTemplate:
+    """Parts of a bilayer CIF shared by every stacking at one interlayer distance"""
+    material: Material2D
+    interlayer_distance: float
+    lattice: np.ndarray          # monolayer lattice
+    new_lattice: np.ndarray      # bilayer cell (c scaled to 30 Å)
+    symbols: List[str]
+    top_frac: np.ndarray         # N×3 fractional coordinates of the unshifted top layer
+    tau_to_frac: np.ndarray      # 2×3 map of tau to its fractional shift in the bilayer cell
+    cell_block: str              # _cell_* lines through the atom_site loop header
+    bottom_rows: str             # formatted atom_site rows of layer 1
+
+
+def prepare_bilayer_cif(material: Material2D, interlayer_distance: float) -> BilayerCIFTemplate:
     """
-    Generate CIF content for a bilayer structure.
+    Precompute everything in a bilayer CIF that does not depend on tau.
     
     Args:
         material: Material2D object with monolayer structure
-        stacking: StackingConfiguration with stacking vector and interlayer distance
-        stacking_name: Name for the structure (e.g., 'AA', 'AB', 'BA')
+        interlayer_distance: Interlayer distance in Angstroms
         
     Returns:
-        CIF format string
+        BilayerCIFTemplate for render_bilayer_cif
     """
     # Get monolayer structure
     lattice = material.lattice
     positions = material.positions
-    numbers = material.numbers
     symbols = material.get_chemical_symbols()
 
-    # Convert Cartesian to fractional coordinates
-    lattice_inv = np.linalg.inv(lattice)
-    positions_frac = np.dot(positions, lattice_inv.T)
-
-    # Special handling for h-BN: Use standard atomic positions
-    if material.formula == 'BN' and material.layer_group == 'p-6m2':
-        positions_frac = np.array([
-            [0.0, 0.0, 0.5],           # B at origin
-            [1.0/3.0, 2.0/3.0, 0.5]   # N at (1/3, 2/3)
-        ])
-
-    # Create bilayer by duplicating and shifting
-    tau = stacking.tau
-    d_interlayer = stacking.interlayer_distance
+    d_interlayer = interlayer_distance
 
     # Get monolayer structure in Cartesian coordinates
     c_old = np.linalg.norm(lattice[2])
@@ -76,45 +83,31 @@ def generate_bilayer_cif(material: Material2D, stacking: StackingConfiguration,
     # Shift so layer starts at vacuum_bottom
     layer1_cart[:, 2] = positions_cart[:, 2] - z_min_cart + vacuum_bottom
 
-    # Position layer 2 (top layer) above layer 1 with gap
-    # Apply in-plane shift in Cartesian coordinates (rigid translation)
-    tau_cart = lattice[:2, :2].T @ tau  # Convert tau to Cartesian
-    layer2_cart = positions_cart.copy()
-    layer2_cart[:, :2] = positions_cart[:, :2] + tau_cart  # Rigid shift in xy
-    # Shift z so layer starts after gap
-    layer2_cart[:, 2] = positions_cart[:, 2] - z_min_cart + vacuum_bottom + mono_thickness + d_interlayer
-
-    # Convert to fractional coordinates in new cell
-    # Fractional = lattice_inv.T @ Cartesian (for column vectors)
-    new_lattice_inv = np.linalg.inv(new_lattice)
-    layer1_positions = np.zeros_like(layer1_cart)
-    layer2_positions = np.zeros_like(layer2_cart)
-    for i in range(len(layer1_cart)):
-        layer1_positions[i] = new_lattice_inv.T @ layer1_cart[i]
-        layer2_positions[i] = new_lattice_inv.T @ layer2_cart[i]
-
-    # Combine both layers
-    all_positions = np.vstack([layer1_positions, layer2_positions])
-    all_symbols = symbols + symbols  # Duplicate symbols
-    all_numbers = np.concatenate([numbers, numbers])
-    
-    # Generate CIF content
-    cif_content = f"""# Generated by SYMPOL2D
-# Material: {material.formula} ({material.uid})
-# Stacking: {stacking_name} - tau = [{stacking.tau[0]:.4f}, {stacking.tau[1]:.4f}]
-# Interlayer distance: {d_interlayer:.3f} A
-# Polarization direction: {stacking.polar_direction or 'non-polar'}
-# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-data_{material.formula}_{stacking_name}
-
-_chemical_name_common     '{material.formula} {stacking_name} bilayer'
-_cell_length_a            {np.linalg.norm(new_lattice[0]):.6f}
-_cell_length_b            {np.linalg.norm(new_lattice[1]):.6f}
-_cell_length_c            {np.linalg.norm(new_lattice[2]):.6f}
-_cell_angle_alpha         {np.degrees(np.arccos(np.dot(new_lattice[1], new_lattice[2])/(np.linalg.norm(new_lattice[1])*np.linalg.norm(new_lattice[2])))):.4f}
-_cell_angle_beta          {np.degrees(np.arccos(np.dot(new_lattice[0], new_lattice[2])/(np.linalg.norm(new_lattice[0])*np.linalg.norm(new_lattice[2])))):.4f}
-_cell_angle_gamma         {np.degrees(np.arccos(np.dot(new_lattice[0], new_lattice[1])/(np.linalg.norm(new_lattice[0])*np.linalg.norm(new_lattice[1])))):.4f}
+    # Layer 2 starts after the gap; its xy shift is applied per stacking
+    top_cart = positions_cart.copy()
+    top_cart[:, 2] = layer1_cart[:, 2] + mono_thickness + d_interlayer
+
+    # The rigid in-plane shift tau_cart = tau @ lattice[:2, :2] is linear, so
+    # its fractional form in the new cell is tau @ tau_to_frac; both layers'
+    # conversions and this map come from one cart_to_frac on the new cell
+    shift_cart = np.zeros((2, 3))
+    shift_cart[:, :2] = lattice[:2, :2]
+    n_mono = len(positions_cart)
+    frac = cart_to_frac(new_lattice, np.vstack([layer1_cart, top_cart, shift_cart]))
+    layer1_positions, top_frac, tau_to_frac = frac[:n_mono], frac[n_mono:-2], frac[-2:]
+
+    # Cell lengths and angles from the metric tensor: one pass over the rows
+    metric = new_lattice @ new_lattice.T
+    a, b, c = np.sqrt(np.diag(metric))
+    alpha, beta, gamma = np.degrees(np.arccos(
+        [metric[1, 2] / (b * c), metric[0, 2] / (a * c), metric[0, 1] / (a * b)]))
+
+    cell_block = f"""_cell_length_a            {a:.6f}
+_cell_length_b            {b:.6f}
+_cell_length_c            {c:.6f}
+_cell_angle_alpha         {alpha:.4f}
+_cell_angle_beta          {beta:.4f}
+_cell_angle_gamma         {gamma:.4f}
 
 _symmetry_space_group_name_H-M    'P 1'
 _symmetry_Int_Tables_number       1
@@ -127,14 +120,72 @@ _atom_site_fract_y
 _atom_site_fract_z
 _atom_site_occupancy
 """
+
+    bottom_rows = "".join(ATOM_ROW_FMT % (f"{symbol}{i}_L1", symbol, x, y, z)
+                          for i, (symbol, (x, y, z)) in enumerate(zip(symbols, layer1_positions.tolist()), 1))
+
+    return BilayerCIFTemplate(
+        material=material,
+        interlayer_distance=d_interlayer,
+        lattice=lattice,
+        new_lattice=new_lattice,
+        symbols=symbols,
+        top_frac=top_frac,
+        tau_to_frac=tau_to_frac,
+        cell_block=cell_block,
+        bottom_rows=bottom_rows,
+    )
+
+
+def render_bilayer_cif(template: BilayerCIFTemplate, stacking: StackingConfiguration,
+                       stacking_name: str = "bilayer") -> str:
+    """
+    Generate CIF content for one stacking from a prepared template.
     
-    # Add atoms
-    for i, (symbol, pos) in enumerate(zip(all_symbols, all_positions)):
-        layer_num = 1 if i < len(symbols) else 2
-        atom_label = f"{symbol}{i+1}_L{layer_num}"
-        cif_content += f"{atom_label:8s} {symbol:2s} {pos[0]:10.6f} {pos[1]:10.6f} {pos[2]:10.6f} 1.0\n"
+    Only the header comments and the top-layer rows are built here; the
+    template's interlayer distance is used.
+    """
+    material = template.material
+
+    # Layer 2 (top layer): rigid in-plane shift by tau, already in fractional form
+    layer2_positions = template.top_frac + np.asarray(stacking.tau, float) @ template.tau_to_frac
+
+    header = f"""# Generated by SYMPOL2D
+# Material: {material.formula} ({material.uid})
+# Stacking: {stacking_name} - tau = [{stacking.tau[0]:.4f}, {stacking.tau[1]:.4f}]
+# Interlayer distance: {template.interlayer_distance:.3f} A
+# Polarization direction: {stacking.polar_direction or 'non-polar'}
+# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+data_{material.formula}_{stacking_name}
+
+_chemical_name_common     '{material.formula} {stacking_name} bilayer'
+"""
+
+    # Top-layer atom indices continue after the bottom layer's
+    symbols = template.symbols
+    n_mono = len(symbols)
+    top_rows = [ATOM_ROW_FMT % (f"{symbol}{i}_L2", symbol, x, y, z)
+                for i, (symbol, (x, y, z)) in enumerate(zip(symbols, layer2_positions.tolist()), n_mono + 1)]
+
+    return "".join((header, template.cell_block, template.bottom_rows, *top_rows))
+
+
+def generate_bilayer_cif(material: Material2D, stacking: StackingConfiguration, 
+                        stacking_name: str = "bilayer") -> str:
+    """
+    Generate CIF content for a bilayer structure.
     
-    return cif_content
+    Args:
+        material: Material2D object with monolayer structure
+        stacking: StackingConfiguration with stacking vector and interlayer distance
+        stacking_name: Name for the structure (e.g., 'AA', 'AB', 'BA')
+        
+    Returns:
+        CIF format string
+    """
+    template = prepare_bilayer_cif(material, stacking.interlayer_distance)
+    return render_bilayer_cif(template, stacking, stacking_name)
 
 
 def save_all_stackings_cif(material: Material2D, stackings: Dict[str, StackingConfiguration],
@@ -152,19 +203,27 @@ def save_all_stackings_cif(material: Material2D, stackings: Dict[str, StackingCo
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     created_files = []
+    contents = []
+    templates = {}  # one template per interlayer distance
     
     for name, config in stackings.items():
         # Generate CIF content
-        cif_content = generate_bilayer_cif(material, config, name)
+        template = templates.get(config.interlayer_distance)
+        if template is None:
+            template = templates[config.interlayer_distance] = prepare_bilayer_cif(
+                material, config.interlayer_distance)
+        contents.append(render_bilayer_cif(template, config, name))
         
         # Create filename
         filename = f"{material.formula}_{name}.cif"
-        filepath = output_dir / filename
-        
-        # Write CIF file
-        with open(filepath, 'w') as f:
-            f.write(cif_content)
-        
-        created_files.append(filepath)
+        created_files.append(output_dir / filename)
+    
+    # Write CIF files; the writes are I/O-bound, so overlap them
+    if len(created_files) > 1:
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            list(executor.map(Path.write_text, created_files, contents))
+    else:
+        for filepath, cif_content in zip(created_files, contents):
+            filepath.write_text(cif_content)
     
     return created_files
\ No newline at end of file
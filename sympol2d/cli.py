@@ -4,18 +4,10 @@ Command-line interface for SYMPOL2D
 """
 
 import argparse
-import json
+import math
 import sys
-import numpy as np
 from pathlib import Path
 
-from .scanner import scan_for_z, pick_best_pair, z_sign_flip_expected
-from .symmetry import mod1
-from .builder import make_bilayer_poscar
-from .poscar_io import load_poscar
-from . import c2db_interface as c2db
-from .cif_writer import StackingConfiguration, generate_bilayer_cif
-
 
 def main():
     """Main CLI entry point"""
@@ -62,11 +54,18 @@ Examples:
         p.print_help()
         return 0
 
+    # NumPy and the analysis modules are only imported once a command runs,
+    # so --help and usage errors stay stdlib-only; export-only modules are
+    # imported in their branch below
+    import numpy as np
+    from .scanner import scan_for_z, pick_best_pair, z_sign_flip_expected
+
     # Resolve layer group (UID → layer_group if DB present)
     lg = args.layer_group
     formula = "X2D"
 
     if args.uid and not lg:
+        from . import c2db_interface as c2db
         rec = c2db.fetch_by_uid(args.uid, args.database)
         if rec:
             lg, formula = rec["layer_group"], rec["formula"]
@@ -114,15 +113,21 @@ Examples:
     # 3) Optional export (POSCARs or CIF) — only when we have monolayer geometry
     if args.export:
         if flip or args.allow_nonflipping:
+            # One float64 array per stacking, shared by both export formats
+            tau_ab = np.asarray(tau, np.float64)
+            tau_ba = np.asarray(tau_ba, np.float64)
+
             # CIF export from c2db
             if args.format == 'cif':
+                from . import c2db_interface as c2db
+                from .cif_writer import StackingConfiguration, prepare_bilayer_cif, render_bilayer_cif
+
                 if not args.uid:
                     print("\nCIF export requires --uid to extract structure from c2db database.")
                     return 1
 
                 print(f"\nExtracting structure from c2db database...")
-                db_interface = c2db.C2DBInterface(args.database)
-                material = db_interface.get_material_by_uid(args.uid)
+                material = c2db.open_db(args.database).get_material_by_uid(args.uid)
 
                 if not material:
                     print(f"Error: Could not load material {args.uid} from database.")
@@ -132,27 +137,26 @@ Examples:
 
                 # Create stacking configurations
                 ab_config = StackingConfiguration(
-                    tau=np.array(tau),
+                    tau=tau_ab,
                     interlayer_distance=args.gap,
                     polar_direction='z' if flip else None
                 )
                 ba_config = StackingConfiguration(
-                    tau=np.array(tau_ba),
+                    tau=tau_ba,
                     interlayer_distance=args.gap,
                     polar_direction='z' if flip else None
                 )
 
-                # Generate CIF files
-                cif_ab = generate_bilayer_cif(material, ab_config, "AB")
-                cif_ba = generate_bilayer_cif(material, ba_config, "BA")
+                # Generate CIF files; both stackings share one template
+                template = prepare_bilayer_cif(material, args.gap)
+                cif_ab = render_bilayer_cif(template, ab_config, "AB")
+                cif_ba = render_bilayer_cif(template, ba_config, "BA")
 
                 ab_file = f"{args.out_prefix}_AB.cif"
                 ba_file = f"{args.out_prefix}_BA.cif"
 
-                with open(ab_file, "w") as f:
-                    f.write(cif_ab)
-                with open(ba_file, "w") as f:
-                    f.write(cif_ba)
+                Path(ab_file).write_text(cif_ab)
+                Path(ba_file).write_text(cif_ba)
 
                 print(f"\nExported bilayer CIF structures:")
                 print(f"  AB: {ab_file}")
@@ -160,47 +164,45 @@ Examples:
 
             # POSCAR export (original method)
             else:
+                from .builder import make_bilayer_poscars
+                from .poscar_io import load_monolayer
+
                 if not args.poscar:
                     print("\nPOSCAR export requires --poscar MONOLAYER_POSCAR to build real bilayers.")
                     return 0
 
-                poscar_path = Path(args.poscar)
-                if not poscar_path.exists():
+                try:
+                    (comment, lattice, symbols, counts, mono_frac, formula_guess,
+                     mono_thick_frac) = load_monolayer(args.poscar)
+                except FileNotFoundError:
                     print(f"\nError: POSCAR file '{args.poscar}' not found.")
                     return 1
-
                 print(f"\nLoading monolayer structure from: {args.poscar}")
-                comment, lattice, symbols, counts, mono_frac, formula_guess = load_poscar(args.poscar)
                 formula = formula_guess or formula
 
                 # Compute dz_frac = monolayer_thickness_frac + gap/c
-                zmin, zmax = mono_frac[:, 2].min(), mono_frac[:, 2].max()
-                mono_thick_frac = (zmax - zmin)  # fractional thickness of monolayer
-                c = lattice[2, 2] if abs(lattice[2, 0]) < 1e-9 and abs(lattice[2, 1]) < 1e-9 else np.linalg.norm(lattice[2])
+                # |c| with scalar math; the usual upright c-axis needs no sqrt at all
+                cx, cy, cz = lattice[2].tolist()
+                off_axis = cx * cx + cy * cy
+                c = cz if off_axis < 1e-18 else math.sqrt(off_axis + cz * cz)
                 dz_frac = mono_thick_frac + args.gap / float(c)
 
                 print(f"Monolayer thickness: {mono_thick_frac*c:.3f} Å ({mono_thick_frac:.4f} fractional)")
                 print(f"Interlayer gap: {args.gap:.3f} Å ({args.gap/c:.4f} fractional)")
                 print(f"Total vertical offset: {dz_frac*c:.3f} Å ({dz_frac:.4f} fractional)")
 
-                poscar_ab = make_bilayer_poscar(
-                    formula=formula, lattice=lattice, frac_coords_mono=mono_frac,
-                    tau=np.array(tau), dz_frac=dz_frac,
-                    comment=f"{formula} bilayer AB (tau={tau[0]:.3f},{tau[1]:.3f})"
-                )
-                poscar_ba = make_bilayer_poscar(
+                poscar_ab, poscar_ba = make_bilayer_poscars(
                     formula=formula, lattice=lattice, frac_coords_mono=mono_frac,
-                    tau=np.array(tau_ba), dz_frac=dz_frac,
-                    comment=f"{formula} bilayer BA (tau={tau_ba[0]:.3f},{tau_ba[1]:.3f})"
+                    taus=[tau_ab, tau_ba], dz_frac=dz_frac,
+                    comments=[f"{formula} bilayer AB (tau={tau_ab[0]:.3f},{tau_ab[1]:.3f})",
+                              f"{formula} bilayer BA (tau={tau_ba[0]:.3f},{tau_ba[1]:.3f})"]
                 )
 
                 ab_file = f"{args.out_prefix}_AB.vasp"
                 ba_file = f"{args.out_prefix}_BA.vasp"
 
-                with open(ab_file, "w") as f:
-                    f.write(poscar_ab)
-                with open(ba_file, "w") as f:
-                    f.write(poscar_ba)
+                Path(ab_file).write_text(poscar_ab)
+                Path(ba_file).write_text(poscar_ba)
 
                 print(f"\nExported bilayer structures:")
                 print(f"  AB: {ab_file}")
@@ -2,8 +2,20 @@
 POSCAR file I/O for SYMPOL2D
 """
 
+import itertools
+import os
 import re
 import numpy as np
+from functools import lru_cache
+
+
+def _next_line(f):
+    """Next non-blank line of an open file, stripped"""
+    for line in f:
+        line = line.strip()
+        if line:
+            return line
+    raise ValueError("Unexpected end of POSCAR file")
 
 
 def load_poscar(path):
@@ -27,33 +39,62 @@ def load_poscar(path):
         - Handles 'Selective dynamics' if present
     """
     with open(path, "r") as f:
-        lines = [l.strip() for l in f if l.strip()]
-
-    comment = lines[0]
-    scale = float(lines[1])
-    lattice = np.array([[float(x) for x in lines[2+i].split()] for i in range(3)], float) * scale
-
-    # VASP5: symbols line then counts
-    sym_line = lines[5].split()
-    cnt_line = [int(x) for x in lines[6].split()]
-    n = sum(cnt_line)
+        comment = _next_line(f)
+        scale = float(_next_line(f))
+        # Nine numbers: one C-level parse, cheaper than np.loadtxt's setup
+        lattice = np.fromstring(" ".join([_next_line(f) for _ in range(3)]),
+                                dtype=np.float64, sep=" ").reshape(3, 3) * scale
 
-    # Check for Direct/Cartesian and selective dynamics
-    mode_idx = 7
-    mode = lines[mode_idx].lower()
-    start = mode_idx + 1
+        # VASP5: symbols line then counts
+        sym_line = _next_line(f).split()
+        cnt_line = [int(x) for x in _next_line(f).split()]
+        n = sum(cnt_line)
 
-    if mode.startswith("selective") or mode.startswith("s"):
-        mode = lines[mode_idx + 1].lower()
-        start = mode_idx + 2
+        # Check for Direct/Cartesian and selective dynamics
+        # VASP only looks at the first character: S(elective), D(irect), C/K (Cartesian)
+        mode = _next_line(f).lower()
+        if mode[0] == "s":
+            mode = _next_line(f).lower()
 
-    if not (mode.startswith("direct") or mode.startswith("d")):
-        raise ValueError(f"Only 'Direct' coordinates supported, found: {mode}")
+        if mode[0] != "d":
+            raise ValueError(f"Only 'Direct' coordinates supported, found: {mode}")
 
-    # Parse coordinates (first 3 columns)
-    coords = np.array([[float(x) for x in lines[start+i].split()[:3]] for i in range(n)], float)
+        # Parse coordinates (first 3 columns) straight from the file in NumPy's
+        # C parser; blank lines, selective-dynamics flags and site labels are skipped
+        coords = np.loadtxt(itertools.islice(filter(str.strip, f), n),
+                            dtype=float, usecols=(0, 1, 2), ndmin=2)
 
     # Build formula string
-    formula = "".join(s + (str(c) if c > 1 else "") for s, c in zip(sym_line, cnt_line))
+    parts = []
+    for s, c in zip(sym_line, cnt_line):
+        parts.append(s)
+        if c > 1:
+            parts.append(str(c))
+    formula = "".join(parts)
 
     return comment, lattice, sym_line, cnt_line, coords, formula
+
+
+def load_monolayer(path):
+    """
+    Read a monolayer POSCAR together with its fractional z-extent.
+
+    Like load_poscar, with the layer thickness appended; the result is cached
+    per file modification time, so the arrays are read-only and symbols/counts
+    are tuples.
+
+    Returns:
+        Tuple of (comment, lattice, symbols, counts, coords, formula, thickness_frac)
+        - thickness_frac: float, max(z) - min(z) of the fractional coordinates
+    """
+    return _load_monolayer(os.fspath(path), os.path.getmtime(path))
+
+
+@lru_cache(maxsize=None)
+def _load_monolayer(path, mtime):
+    """Parse once per (path, mtime) and derive the thickness while coords are hot"""
+    comment, lattice, symbols, counts, coords, formula = load_poscar(path)
+    thickness_frac = float(np.ptp(coords[:, 2]))
+    lattice.flags.writeable = False
+    coords.flags.writeable = False
+    return comment, lattice, tuple(symbols), tuple(counts), coords, formula, thickness_frac
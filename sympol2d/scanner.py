@@ -2,14 +2,30 @@
 Stacking configuration scanner for SYMPOL2D
 """
 
+import os
 import numpy as np
-from .symmetry import LAYER_GROUP_OPERATIONS, survives, classify_z_allowed, Z_SIGN_FLIP_EXPECTED, mod1
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from .symmetry import OPER, LAYER_GROUP_OPERATIONS, Z_SIGN_FLIP_EXPECTED, mod1
 
 
 def grid_points(n):
     """Generate n×n grid of fractional coordinates in [0,1)"""
     xs = np.linspace(0, 1, n, endpoint=False)
-    return np.array([(x, y) for x in xs for y in xs], float)
+    gx, gy = np.meshgrid(xs, xs, indexing='ij')
+    return np.column_stack([gx.ravel(), gy.ravel()])
+
+
+@lru_cache(maxsize=None)
+def _group_operators(layer_group):
+    """Operation names and their stacked (Nops, 2, 2) E + R matrices for a layer group"""
+    ops = LAYER_GROUP_OPERATIONS.get(layer_group)
+    if not ops:
+        raise ValueError(f"Unsupported layer group: {layer_group}")
+    e_plus_r = np.eye(2) + np.array([OPER[R] for R in ops])
+    e_plus_r.flags.writeable = False
+    return tuple(ops), e_plus_r
 
 
 def survivors_at_tau(layer_group, tau, atol=1e-8):
@@ -24,35 +40,166 @@ def survivors_at_tau(layer_group, tau, atol=1e-8):
     Returns:
         List of operation names that survive
     """
-    ops = LAYER_GROUP_OPERATIONS.get(layer_group)
-    if not ops:
-        raise ValueError(f"Unsupported layer group: {layer_group}")
-    return [R for R in ops if survives(R, np.array(tau, float), atol=atol)]
+    ops, e_plus_r = _group_operators(layer_group)
+    row = survivor_mask(np.array(tau, float).reshape(1, 2), e_plus_r, atol)[0]
+    return [R for R, ok in zip(ops, row.tolist()) if ok]
+
+
+def _survivor_mask_numpy(pts, e_plus_r, atol):
+    """(Npts, Nops) mask of (E + R)τ ∈ Z² for every grid point τ and operation R"""
+    # 2×2 products written out per entry: (Npts, Nops) arrays, no generic matmul
+    x, y = pts[:, 0:1], pts[:, 1:2]
+    u = x * e_plus_r[:, 0, 0] + y * e_plus_r[:, 0, 1]
+    v = x * e_plus_r[:, 1, 0] + y * e_plus_r[:, 1, 1]
+    return (np.abs(u - np.rint(u)) <= atol) & (np.abs(v - np.rint(v)) <= atol)
+
+def _survivor_mask_loop(pts, e_plus_r, atol):
+    """Loop version of _survivor_mask_numpy without the (Npts, Nops, 2) temporary (for numba)"""
+    n = pts.shape[0]
+    m = e_plus_r.shape[0]
+    out = np.empty((n, m), dtype=np.bool_)
+    for i in range(n):
+        for k in range(m):
+            ok = True
+            for r in range(2):
+                v = e_plus_r[k, r, 0] * pts[i, 0] + e_plus_r[k, r, 1] * pts[i, 1]
+                if abs(v - np.rint(v)) > atol:
+                    ok = False
+            out[i, k] = ok
+    return out
+
+# Ahead-of-time build (python -m sympol2d.build_aot), which needs no
+# compilation at startup
+try:
+    from ._kernels import survivor_mask as _survivor_mask_aot
+except ImportError:
+    _survivor_mask_aot = None
+
+# Grid points from which the JIT kernel is used: below it, importing numba and
+# loading the compiled kernel (~0.45 s) cost more than it saves over NumPy
+# (~0.17 us per point). The default 60×60 scan (3600 points) never gets close
+NUMBA_MIN_POINTS = 2_000_000
+
+
+@lru_cache(maxsize=1)
+def _survivor_mask_jit():
+    """numba-compiled _survivor_mask_loop, or None without numba"""
+    try:
+        import numba
+    except ImportError:  # optional: NumPy only
+        return None
+    return numba.njit(cache=True)(_survivor_mask_loop)
+
+
+def survivor_mask(pts, e_plus_r, atol):
+    """(Npts, Nops) survivor mask: the AOT kernel if built, else the JIT for large grids, else NumPy"""
+    if _survivor_mask_aot is not None:
+        return _survivor_mask_aot(pts, e_plus_r, atol)
+    kernel = _survivor_mask_jit() if len(pts) >= NUMBA_MIN_POINTS else None
+    return (kernel or _survivor_mask_numpy)(pts, e_plus_r, atol)
+
+# Survivor masks precomputed for the default scan (python -m sympol2d.build_tables)
+SURVIVOR_TABLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_survivor_tables.npz')
+
+
+@lru_cache(maxsize=1)
+def _survivor_tables():
+    """The precomputed table file, or None when it has not been built"""
+    try:
+        return np.load(SURVIVOR_TABLES)
+    except OSError:
+        return None
+
+
+def _precomputed_mask(layer_group, ngrid, atol, e_plus_r):
+    """Stored survivor mask for this scan, if the table matches it exactly"""
+    tables = _survivor_tables()
+    if tables is None or f"mask:{layer_group}" not in tables.files:
+        return None
+    # Stale tables (other grid, tolerance or operator matrices) are ignored
+    if (int(tables["ngrid"]) != ngrid or float(tables["atol"]) != atol
+            or not np.array_equal(tables[f"e_plus_r:{layer_group}"], e_plus_r)):
+        return None
+    return tables[f"mask:{layer_group}"]
+
+
+@dataclass(frozen=True, eq=False)
+class ScanResult(Sequence):
+    """
+    scan_for_z candidates stored as arrays (one row per grid point).
+
+    Behaves as a read-only sequence of candidate dictionaries, built on access;
+    list(result) gives a mutable list of them.
+
+    Attributes:
+        ops: Operation names of the layer group (columns of survived)
+        taus: N×2 stacking vectors
+        survived: N×Nops boolean mask of surviving operations
+        z_only: N boolean mask of the "z-only" class (C2 kept, Mx and My broken)
+    """
+    ops: tuple
+    taus: np.ndarray
+    survived: np.ndarray
+    z_only: np.ndarray
+
+    def __len__(self):
+        return len(self.taus)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return {"tau": self.taus[i],
+                "survivors": [R for R, ok in zip(self.ops, self.survived[i].tolist()) if ok],
+                "tag": "z-only" if self.z_only[i] else "z-allowed"}
 
 
 def scan_for_z(layer_group, ngrid=60, atol=1e-8):
     """
     Scan tau-space for z-polarization allowed stackings.
 
+    The scan is memoized per (layer_group, ngrid, atol); every call returns
+    a new ScanResult with its own writable arrays.
+
     Args:
         layer_group: Layer group symbol
         ngrid: Grid resolution (ngrid × ngrid points)
         atol: Tolerance for symmetry test
 
     Returns:
-        List of candidate dictionaries with keys:
+        ScanResult: sequence of candidate dictionaries with keys:
             - tau: stacking vector
             - survivors: list of surviving operations
             - tag: "z-only" or "z-allowed"
     """
+    ops, pts, mask, z_only = _scan_arrays(layer_group, ngrid, atol)
+    return ScanResult(ops, pts.copy(), mask.copy(), z_only.copy())
+
+
+@lru_cache(maxsize=64)
+def _scan_arrays(layer_group, ngrid, atol):
+    """Operation names, grid, survivor mask and z-only mask of a scan (shared, read-only)"""
+    ops, e_plus_r = _group_operators(layer_group)
+
     pts = grid_points(ngrid)
-    keep = []
-    for t in pts:
-        surv = survivors_at_tau(layer_group, t, atol=atol)
-        z_ok, tag = classify_z_allowed(surv)
-        if z_ok:
-            keep.append({"tau": t, "survivors": surv, "tag": tag})
-    return keep
+    pts.flags.writeable = False
+    mask = _precomputed_mask(layer_group, ngrid, atol, e_plus_r)
+    if mask is None:
+        mask = survivor_mask(pts, e_plus_r, atol)
+
+    # classify_z_allowed over the whole grid: every point is z-allowed, and
+    # z-only where C2 survives with both mirrors broken
+    column = {R: mask[:, k] for k, R in enumerate(ops)}
+    absent = np.zeros(len(pts), dtype=bool)
+    z_only = column.get('C2', absent) & ~column.get('Mx', absent) & ~column.get('My', absent)
+    mask.flags.writeable = False
+    z_only.flags.writeable = False
+    return ops, pts, mask, z_only
+
+
+# Fractions used to rank stacking vectors (see rational_score)
+THIRD_FRACS = np.array([1/3, 2/3])
+HALF_SHIFTS = np.array([0.0, 0.5, 1.0])
+SIMPLE_FRACS = np.array([1/2, 1/3, 2/3, 1/4, 3/4, 1/6, 5/6])
 
 
 def distance_to_mirror_lines(t):
@@ -83,9 +230,8 @@ def rational_score(t):
         Score (lower is better) based on distance to simple fractions
     """
     # Check for 1/3 or 2/3 (most common for 2D materials)
-    third_fracs = np.array([1/3, 2/3])
-    dist_third_x = np.min(abs(t[0] - third_fracs))
-    dist_third_y = np.min(abs(t[1] - third_fracs))
+    dist_third_x = np.min(abs(t[0] - THIRD_FRACS))
+    dist_third_y = np.min(abs(t[1] - THIRD_FRACS))
 
     # If both coordinates are 1/3 or 2/3, give highest priority
     if dist_third_x < 0.01 and dist_third_y < 0.01:
@@ -96,16 +242,34 @@ def rational_score(t):
             return 0.1
 
     # Check for 1/2 shifts (less common but still important)
-    half_shifts = np.array([0.0, 0.5, 1.0])
-    dist_half_x = np.min(abs(t[0] - half_shifts))
-    dist_half_y = np.min(abs(t[1] - half_shifts))
+    dist_half_x = np.min(abs(t[0] - HALF_SHIFTS))
+    dist_half_y = np.min(abs(t[1] - HALF_SHIFTS))
 
     if dist_half_x < 0.01 and dist_half_y < 0.01:
         return 0.2
 
     # Otherwise use general fractional score
-    fracs = np.array([1/2, 1/3, 2/3, 1/4, 3/4, 1/6, 5/6])
-    return 1.0 + np.min(abs(t[0]-fracs)) + np.min(abs(t[1]-fracs))
+    return 1.0 + np.min(abs(t[0]-SIMPLE_FRACS)) + np.min(abs(t[1]-SIMPLE_FRACS))
+
+
+def _nearest_frac_distance(taus, fracs):
+    """(N, 2) distance of each tau component to its nearest value in fracs"""
+    return np.abs(taus[:, :, None] - fracs).min(axis=2)
+
+
+def _mirror_line_distances(taus):
+    """distance_to_mirror_lines for an (N, 2) array of stacking vectors"""
+    return _nearest_frac_distance(taus, HALF_SHIFTS).sum(axis=1)
+
+
+def _rational_scores(taus):
+    """rational_score for an (N, 2) array of stacking vectors"""
+    near_third = (_nearest_frac_distance(taus, THIRD_FRACS) < 0.01).all(axis=1)
+    near_half = (_nearest_frac_distance(taus, HALF_SHIFTS) < 0.01).all(axis=1)
+    diagonal = np.abs(taus[:, 0] - taus[:, 1]) < 0.01
+    d = _nearest_frac_distance(taus, SIMPLE_FRACS)
+    return np.select([near_third & diagonal, near_third, near_half],
+                     [0.0, 0.1, 0.2], 1.0 + d[:, 0] + d[:, 1])
 
 
 def pick_best_pair(layer_group, candidates, prefer_strict=True):
@@ -120,7 +284,7 @@ def pick_best_pair(layer_group, candidates, prefer_strict=True):
 
     Args:
         layer_group: Layer group symbol
-        candidates: List of candidate dictionaries from scan_for_z
+        candidates: ScanResult (or list of candidate dictionaries) from scan_for_z
         prefer_strict: If True, prefer "z-only" over "z-allowed"
 
     Returns:
@@ -128,30 +292,28 @@ def pick_best_pair(layer_group, candidates, prefer_strict=True):
 
         For most layer groups: tau_ba = 1 - tau_ab (inversion pair)
     """
-    cands = candidates
-    if prefer_strict:
-        strict = [c for c in cands if c["tag"] == "z-only"]
-        if strict:
-            cands = strict
-
-    # Filter out self-inverse tau (where 1-tau ≈ tau)
-    def is_self_inverse(tau, atol=1e-3):
-        """Check if tau is self-inverse: mod1(1-tau) ≈ tau"""
-        tau_inv = mod1(1.0 - tau)
-        return np.allclose(tau_inv, tau, atol=atol)
-
-    cands = [c for c in cands if not is_self_inverse(c["tau"])]
-
-    def key(c):
-        t = c["tau"]
-        # Prioritize simple rational fractions first, then maximize distance from mirrors
-        return (rational_score(t), -distance_to_mirror_lines(t))
-
-    cands = sorted(cands, key=key)
-    if not cands:
+    if isinstance(candidates, ScanResult):
+        taus, z_only = candidates.taus, candidates.z_only
+    else:
+        taus = np.array([c["tau"] for c in candidates], float).reshape(-1, 2)
+        z_only = np.array([c["tag"] == "z-only" for c in candidates], dtype=bool)
+
+    idx = np.arange(len(taus))
+    if prefer_strict and z_only.any():
+        idx = idx[z_only]
+
+    # Filter out self-inverse tau (where mod1(1-tau) ≈ tau, as np.allclose with atol=1e-3)
+    taus = taus[idx]
+    self_inverse = np.all(np.abs(mod1(1.0 - taus) - taus) <= 1e-3 + 1e-5 * np.abs(taus), axis=1)
+    idx = idx[~self_inverse]
+    if not len(idx):
         return None, None
 
-    tau_ab = cands[0]["tau"]
+    # Prioritize simple rational fractions first, then maximize distance from mirrors
+    taus = taus[~self_inverse]
+    order = np.lexsort((-_mirror_line_distances(taus), _rational_scores(taus)))
+    # Independent of the candidates (a ScanResult row would be a view)
+    tau_ab = np.array(candidates[idx[order[0]]]["tau"], dtype=float)
     tau_ba = mod1(1.0 - tau_ab)
 
     return tau_ab, tau_ba
@@ -3,6 +3,7 @@ Core symmetry analysis module for SYMPOL2D
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 
@@ -29,8 +30,21 @@ OPER = {
 
     'C4': np.array([[ 0, -1],
                     [ 1,  0]], float),
+
+    # Inverse rotations, written out exactly instead of as matrix powers
+    'C3^2': np.array([[-0.5,  np.sqrt(3)/2],
+                      [-np.sqrt(3)/2, -0.5]], float),
+
+    'C4^3': np.array([[ 0,  1],
+                      [-1,  0]], float),
+
+    'C6^5': np.array([[ 0.5,  np.sqrt(3)/2],
+                      [-np.sqrt(3)/2, 0.5]], float),
 }
 
+# E + R as nested tuples of Python floats, for the scalar test in survives()
+E_PLUS_R = {name: tuple(map(tuple, (np.eye(2) + M).tolist())) for name, M in OPER.items()}
+
 # Minimal layer-group → linear-ops dictionary for our test.
 # Glides/centerings: same linear part as mirrors/rotations; translations are absorbed on RHS.
 LAYER_GROUP_OPERATIONS = {
@@ -110,9 +124,10 @@ def survives(R, tau, atol=1e-8):
     Test if operation R survives at stacking vector tau.
     Condition: (E + R)τ ∈ Z²
     """
-    M = OPER[R]
-    lhs = (np.eye(2) + M) @ tau
-    return is_integer_vec(lhs, atol=atol)
+    (a, b), (c, d) = E_PLUS_R[R]
+    x, y = float(tau[0]), float(tau[1])
+    u, v = a * x + b * y, c * x + d * y
+    return abs(u - round(u)) <= atol and abs(v - round(v)) <= atol
 
 def classify_z_allowed(survivors):
     """
@@ -123,8 +138,7 @@ def classify_z_allowed(survivors):
         - "z-only": C2 survives, both Mx and My broken (strong z-polar class)
         - "z-allowed": Pz not forbidden by surviving in-plane ops
     """
-    ops = set(survivors)
-    mx, my, c2 = ('Mx' in ops), ('My' in ops), ('C2' in ops)
+    mx, my, c2 = ('Mx' in survivors), ('My' in survivors), ('C2' in survivors)
 
     if c2 and (not mx) and (not my):
         return True, "z-only"
@@ -149,10 +163,39 @@ class LayerGroupSymmetry:
     # Keep old operation names for backwards compatibility
     OPERATIONS = OPER
 
+    # Operations and derived tables per layer group, shared by all instances
+    _OPS_CACHE: Dict[str, tuple] = {}
+
     def __init__(self, layer_group: str):
         """Initialize with a layer group symbol"""
         self.layer_group = layer_group.lower()
-        self.operations = self._generate_operations()
+        cached = self._OPS_CACHE.get(self.layer_group)
+        if cached is None:
+            cached = self._OPS_CACHE[self.layer_group] = self._build_operation_tables()
+        (operations, self._op_names, self._polar_op_names,
+         self._bulk_weights, self._bulk_is_mirror) = cached
+        self.operations = list(operations)
+
+    def _build_operation_tables(self) -> tuple:
+        """Generate the operations and the lookup tables derived from them"""
+        operations = tuple(self._generate_operations())
+        op_names = tuple(op.name for op in operations)
+
+        # Operations whose breaking makes a stacking polar (classify_stacking)
+        polar_op_names = tuple(op.name for op in operations
+                               if op.type in ['mirror', 'inversion'])
+
+        # classify_bulk only looks at the mirrors and C2: the four entries of
+        # their E + R as rows of a 4×K table, so the 2×2 products for every
+        # tau are written out elementwise instead of going through a matmul
+        bulk_ops = [op for op in operations if op.type == 'mirror' or op.name == 'C2']
+        e_plus_r = np.eye(2) + np.array([op.matrix for op in bulk_ops]).reshape(-1, 2, 2)
+        bulk_weights = np.ascontiguousarray(e_plus_r.reshape(-1, 4).T)
+        bulk_is_mirror = np.array([op.type == 'mirror' for op in bulk_ops], dtype=bool)
+        bulk_weights.flags.writeable = False
+        bulk_is_mirror.flags.writeable = False
+
+        return operations, op_names, polar_op_names, bulk_weights, bulk_is_mirror
 
     def _generate_operations(self) -> List[SymmetryOperation]:
         """Generate symmetry operations for the layer group"""
@@ -168,11 +211,6 @@ class LayerGroupSymmetry:
         for op_name in op_names:
             if op_name in OPER:
                 matrix = OPER[op_name]
-            elif '^' in op_name:
-                # Handle powers like C3^2
-                base, power = op_name.split('^')
-                base_matrix = OPER[base]
-                matrix = np.linalg.matrix_power(base_matrix, int(power))
             else:
                 print(f"Warning: Unknown operation '{op_name}'")
                 continue
@@ -203,9 +241,10 @@ class LayerGroupSymmetry:
             Dictionary mapping operation names to preservation status
         """
         results = {}
+        xy = (float(tau[0]), float(tau[1]))  # unbox once, not per operation
 
-        for op in self.operations:
-            results[op.name] = survives(op.name, tau, atol=tolerance)
+        for name in self._op_names:
+            results[name] = survives(name, xy, atol=tolerance)
 
         return results
 
@@ -219,19 +258,69 @@ class LayerGroupSymmetry:
         Returns:
             'AA' if all symmetries preserved, 'polar' otherwise
         """
-        preserved = self.test_symmetry_preservation(tau)
+        # Polar as soon as a mirror or inversion symmetry is broken; AA stacking
+        # (all symmetries preserved) and broken rotations alone are non-polar,
+        # so the other operations never need testing
+        for name in self._polar_op_names:
+            if not survives(name, tau, atol=1e-6):
+                return 'polar'
+        return 'AA'
 
-        # AA stacking preserves all symmetries
-        if all(preserved.values()):
-            return 'AA'
+    def classify_and_get(self, tau: np.ndarray, tolerance: float = 1e-6) -> Tuple[str, Dict[str, bool]]:
+        """
+        classify_stacking and test_symmetry_preservation from a single pass.
 
-        # Check if any mirror or inversion symmetry is broken
-        for op in self.operations:
-            if op.type in ['mirror', 'inversion'] and not preserved[op.name]:
-                return 'polar'
+        Args:
+            tau: 2D stacking vector in fractional coordinates
+            tolerance: Numerical tolerance for integer check
 
-        # If only rotations are broken, might still be non-polar
-        return 'AA'
+        Returns:
+            (stacking_type, preserved): 'AA' or 'polar', and the dictionary
+            mapping operation names to preservation status
+        """
+        preserved = self.test_symmetry_preservation(tau, tolerance)
+        polar = not all(preserved[name] for name in self._polar_op_names)
+        return ('polar' if polar else 'AA'), preserved
+
+    def classify_bulk(self, taus: np.ndarray, tolerance: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized classify_stacking over many stacking vectors at once.
+
+        Args:
+            taus: N×2 array of stacking vectors in fractional coordinates
+            tolerance: Numerical tolerance for integer check
+
+        Returns:
+            (is_polar, z_only): boolean arrays of shape (N,)
+            - is_polar: True where classify_stacking would return 'polar'
+            - z_only: True where C2 survives and every mirror is broken
+        """
+        taus = np.asarray(taus, dtype=float).reshape(-1, 2)
+
+        # (N, K) preservation of every mirror/C2 operation for every tau
+        a, b, c, d = self._bulk_weights
+        x, y = taus[:, 0:1], taus[:, 1:2]
+        u, v = x * a + y * b, x * c + y * d
+        kept = (np.abs(u - np.rint(u)) <= tolerance) & (np.abs(v - np.rint(v)) <= tolerance)
+
+        mirrors = kept[:, self._bulk_is_mirror]
+        c2_kept = kept[:, ~self._bulk_is_mirror].any(axis=1)
+        return ~mirrors.all(axis=1), c2_kept & ~mirrors.any(axis=1)
+
+    def classify_stacking_grid(self, n: int) -> np.ndarray:
+        """
+        classify_stacking over the n×n grid tau = [i/n, j/n] in one call.
+
+        Args:
+            n: Number of grid points along each lattice vector
+
+        Returns:
+            n×n array of 'AA' / 'polar', indexed [i, j]
+        """
+        steps = np.arange(n) / n
+        tx, ty = np.meshgrid(steps, steps, indexing='ij')
+        is_polar, _ = self.classify_bulk(np.stack([tx.ravel(), ty.ravel()], axis=1))
+        return np.where(is_polar, 'polar', 'AA').reshape(n, n)
 
     def get_broken_symmetries(self, tau: np.ndarray) -> List[str]:
         """Get list of symmetries broken by a stacking"""
@@ -242,3 +331,14 @@ class LayerGroupSymmetry:
         """Get list of symmetries preserved by a stacking"""
         preserved = self.test_symmetry_preservation(tau)
         return [op for op, is_preserved in preserved.items() if is_preserved]
+
+
+def get_symmetry(layer_group: str) -> LayerGroupSymmetry:
+    """Return a shared LayerGroupSymmetry instance for a layer group symbol"""
+    # LayerGroupSymmetry lower-cases the symbol; share one instance per group
+    return _shared_symmetry(layer_group.lower())
+
+
+@lru_cache(maxsize=None)
+def _shared_symmetry(layer_group: str) -> LayerGroupSymmetry:
+    return LayerGroupSymmetry(layer_group)
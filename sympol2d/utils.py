@@ -25,6 +25,33 @@ VDW_RADII = {
     74: 2.10,  # W
 }
 
+# Interlayer distance used for all vdW bilayers (Angstroms)
+DEFAULT_INTERLAYER_DISTANCE = 3.1
+
+# Off-diagonal entries of a 3×3 lattice matrix
+_OFFDIAG = ~np.eye(3, dtype=bool)
+
+def is_diagonal(lattice: np.ndarray) -> bool:
+    """Check if the lattice matrix has no off-diagonal components"""
+    return not lattice[_OFFDIAG].any()
+
+
+def cart_to_frac(lattice: np.ndarray, cart: np.ndarray) -> np.ndarray:
+    """
+    Convert Cartesian to fractional coordinates.
+    
+    Args:
+        lattice: 3×3 lattice vectors (rows) in Angstroms
+        cart: N×3 Cartesian coordinates in Angstroms
+        
+    Returns:
+        N×3 fractional coordinates
+    """
+    if is_diagonal(lattice):
+        return cart / np.diag(lattice)
+    return cart @ np.linalg.inv(lattice)
+
+
 def estimate_interlayer_distance(atomic_numbers: np.ndarray) -> float:
     """
     Estimate reasonable interlayer distance based on atomic composition.
@@ -35,29 +62,6 @@ def estimate_interlayer_distance(atomic_numbers: np.ndarray) -> float:
     Returns:
         Estimated interlayer distance in Angstroms
     """
-    # Get unique elements
-    unique_elements = np.unique(atomic_numbers)
-    
-    # Find maximum vdW radius
-    max_radius = 1.7  # Default for carbon
-    for z in unique_elements:
-        if z in VDW_RADII:
-            max_radius = max(max_radius, VDW_RADII[z])
-    
-    # Interlayer distance is approximately 2 * vdW radius + 0.5-1.0 Å gap
-    # Common values:
-    # - Graphene/hBN: ~3.3-3.5 Å
-    # - TMDCs (MoS2, WS2): ~6.0-6.5 Å  
-    # - Other chalcogenides: ~5.5-6.0 Å
-    
-    # Simple heuristic based on heaviest element
-    # Updated to use 3.1 Å as default for vdW materials
-    if any(z > 40 for z in unique_elements):  # Transition metals
-        if any(z in [16, 34, 52] for z in unique_elements):  # TMDCs
-            return 3.1  # Typical for vdW bilayers
-        else:
-            return 3.1
-    elif any(z in [16, 34, 52] for z in unique_elements):  # Chalcogens without TM
-        return 3.1
-    else:
-        return 3.1  # Default for all vdW materials
\ No newline at end of file
+    # Every composition branch (transition metals, chalcogens, others) settled
+    # on the same 3.1 Å default, so the composition is not inspected
+    return DEFAULT_INTERLAYER_DISTANCE
\ No newline at end of file